@@ -0,0 +1,88 @@
+import os
+import json
+
+
+class AssetManifest:
+    """The asset files under a root folder, scanned once per run.
+
+    Each directory's listing is cached together with its mtime, so a later
+    run only re-lists the directories that gained or lost entries and
+    otherwise costs one stat per directory. Existence checks are set
+    lookups on paths relative to the root, e.g. 'images/item/wood.png'.
+    """
+
+    def __init__(self, root: str, folders: list[str], cache_file: str):
+        self.root = root
+        self.cache_file = cache_file
+        self.cache = {}
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r') as f:
+                try:
+                    self.cache = json.load(f)
+                except json.JSONDecodeError:
+                    pass
+        self.listings = {}
+        self.files = set()
+        for folder in folders:
+            self.scan(folder)
+        if self.listings != self.cache:
+            self.save()
+
+    def scan(self, folder: str):
+        to_scan = [folder]
+        while to_scan:
+            directory = to_scan.pop()
+            try:
+                mtime = os.stat(os.path.join(self.root, directory)).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            listing = self.cache.get(directory)
+            if listing is None or listing['mtime'] != mtime:
+                listing = self.list_directory(directory, mtime)
+            self.listings[directory] = listing
+            self.files.update(f'{directory}/{name}' for name in listing['files'])
+            to_scan.extend(f'{directory}/{name}' for name in listing['directories'])
+
+    def list_directory(self, directory: str, mtime: int) -> dict:
+        files = []
+        directories = []
+        with os.scandir(os.path.join(self.root, directory)) as entries:
+            for entry in entries:
+                # is_file() follows symlinks like os.path.isfile does, so a
+                # link into the image store counts only if its blob exists.
+                if entry.is_file():
+                    files.append(entry.name)
+                elif entry.is_dir() and not entry.name.startswith('.'):
+                    # Hidden folders (the image store's blobs) hold no assets.
+                    directories.append(entry.name)
+        return {'mtime': mtime, 'files': sorted(files), 'directories': sorted(directories)}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        temp_file = f"{self.cache_file}.part"
+        with open(temp_file, 'w') as f:
+            json.dump(self.listings, f)
+        os.replace(temp_file, self.cache_file)
+
+    def exists(self, path: str | None) -> bool:
+        return path in self.files
+
+
+def missing_asset_report(missing: list[dict]) -> dict:
+    """Group per-item missing assets by asset, for whoever has to make them.
+
+    `missing` holds one {'item', 'images', 'videos'} entry per item; the
+    report keeps those and adds, per missing image and video, the items
+    whose guides use it.
+    """
+    report = {'items': [], 'images': {}, 'videos': {}}
+    for entry in missing:
+        if not entry['images'] and not entry['videos']:
+            continue
+        report['items'].append(entry)
+        for kind in ('images', 'videos'):
+            for path in entry[kind]:
+                report[kind].setdefault(path, []).append(entry['item'])
+    for kind in ('images', 'videos'):
+        report[kind] = dict(sorted(report[kind].items()))
+    return report
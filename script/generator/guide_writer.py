@@ -0,0 +1,110 @@
+import os
+import re
+import json
+
+GUIDE_FORMATS = ('json', 'jsonl')
+SEPARATOR_RE = re.compile(r'\s*,?\s*')
+
+
+class GuideWriter:
+    """Writes each item's guide to disk as soon as it is generated.
+
+    'json' writes the array json.dump(guides, indent=4) used to write, one
+    element at a time; 'jsonl' writes one guide per line. Compact output
+    drops the indentation and the spaces after separators.
+
+    With resume, the guides already in the file are kept (a partly written
+    trailing one is cut off), their items are listed in `done` and the
+    guides themselves in `existing`, and new guides are appended after them.
+    A file that is not empty but holds no guide in the chosen format raises
+    ValueError rather than being overwritten.
+    """
+
+    def __init__(self, path: str, guide_format: str = 'json', compact: bool = False,
+                 resume: bool = False):
+        if guide_format not in GUIDE_FORMATS:
+            raise ValueError(f'Unknown guide format: {guide_format}')
+        self.path = path
+        self.guide_format = guide_format
+        self.compact = compact
+        self.indent = None if compact or guide_format == 'jsonl' else 4
+        self.separators = (',', ':') if compact else None
+        self.count = 0
+        self.done = set()
+        self.existing = []
+
+        end = self.read_existing() if resume and os.path.exists(path) else None
+        if end is None:
+            self.file = open(path, 'w')
+            if guide_format == 'json':
+                self.file.write('[')
+        else:
+            self.file = open(path, 'r+')
+            self.file.seek(end)
+            self.file.truncate()
+
+    def read_existing(self) -> int | None:
+        # Offset just past the last complete guide, or None to start over.
+        with open(self.path, 'r') as f:
+            text = f.read()
+        end = None
+        if self.guide_format == 'jsonl':
+            end = 0
+            for line in text.splitlines(keepends=True):
+                if not line.endswith('\n'):
+                    break
+                try:
+                    guide = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self.add_done(guide)
+                end += len(line)
+            if not self.count and text.strip():
+                raise self.unreadable()
+        else:
+            decoder = json.JSONDecoder()
+            position = SEPARATOR_RE.match(text).end()
+            if not text.startswith('[', position):
+                if text.strip():
+                    raise self.unreadable()
+                return None
+            position = end = position + 1
+            while True:
+                position = SEPARATOR_RE.match(text, position).end()
+                try:
+                    guide, position = decoder.raw_decode(text, position)
+                except json.JSONDecodeError:
+                    break
+                self.add_done(guide)
+                end = position
+        # Guides are written ASCII-only, but the offset is a byte offset.
+        return len(text[:end].encode('utf-8'))
+
+    def unreadable(self) -> ValueError:
+        return ValueError(
+            f'Cannot resume {self.path}: it holds no complete {self.guide_format} '
+            f'guide. Choose the format it was written in or another output file.'
+        )
+
+    def add_done(self, guide: dict):
+        self.done.add(guide['item'])
+        self.existing.append(guide)
+        self.count += 1
+
+    def write(self, guide: dict):
+        text = json.dumps(guide, indent=self.indent, separators=self.separators)
+        if self.guide_format == 'jsonl':
+            self.file.write(f'{text}\n')
+        elif self.indent is None:
+            self.file.write(f'{"," if self.count else ""}{text}')
+        else:
+            text = text.replace('\n', '\n    ')
+            self.file.write(f'{"," if self.count else ""}\n    {text}')
+        self.count += 1
+        # Everything written so far survives a crash and can be resumed.
+        self.file.flush()
+
+    def close(self):
+        if self.guide_format == 'json':
+            self.file.write('\n]' if self.count and self.indent is not None else ']')
+        self.file.close()
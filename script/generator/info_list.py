@@ -1,64 +1,170 @@
+from records import ColumnStore
+
+
 class InfoList:
-    def __init__(self, content: list, sort_key: str):
-        self.content = content
+    def __init__(self, content: list, sort_key: str, columnar: bool = False):
         self.sort_key = sort_key
-        self.content.sort(key=lambda x: getattr(x, self.sort_key).lower())
+        self.columnar = columnar
+        self.content = content
 
-    def get_items(self, key: str, value: str) -> list:
-        if key == self.sort_key:
-            return self.binary_search(value)
-        else:
-            return self.linear_search(key, value)
+    @property
+    def content(self) -> list:
+        return self._content
+
+    @content.setter
+    def content(self, content: list):
+        self._content = content
+        self._content.sort(key=lambda x: getattr(x, self.sort_key).lower())
+        self.sort_values = [getattr(x, self.sort_key).lower() for x in self._content]
+        if self.columnar and self._content:
+            # Rows are rebuilt on access, so lookups return equal records
+            # rather than the same objects each time.
+            self._content = ColumnStore(type(self._content[0]), self._content)
+        # Per-key indexes are filled on first lookup and dropped whenever the
+        # content is assigned; mutating it in place leaves them stale.
+        self.indexes = {}
+
+    def get_items(self, key: str = None, value: str = None, **criteria) -> list:
+        if key is not None:
+            criteria[key] = value
+        if len(criteria) == 1:
+            ((key, value),) = criteria.items()
+            return list(self.lookup(key, value))
+        # Narrow down with the most selective key, then check the rest.
+        candidates = min((self.lookup(k, v) for k, v in criteria.items()), key=len)
+        return [item for item in candidates if all(
+            self.matches(item, k, v) for k, v in criteria.items()
+        )]
 
-    def get_item(self, key: str, value: str):
-        items = self.get_items(key, value)
+    def get_item(self, key: str = None, value: str = None, **criteria):
+        if key is not None:
+            criteria[key] = value
+        if len(criteria) == 1:
+            ((key, value),) = criteria.items()
+            items = self.lookup(key, value)
+        else:
+            items = self.get_items(**criteria)
         if len(items) == 0:
             return None
         else:
             return items[0]
 
+    def derived_index(self, name: str, build) -> dict:
+        # Indexes a subclass computes from its content; they are dropped
+        # along with the per-key ones when the content changes.
+        key = ('derived', name)
+        if key not in self.indexes:
+            self.indexes[key] = build()
+        return self.indexes[key]
+
+    def matches(self, item, key: str, value: str) -> bool:
+        if key == self.sort_key:
+            return getattr(item, key).lower() == value.lower()
+        return getattr(item, key) == value
+
+    def lookup(self, key: str, value: str) -> list:
+        # Items for one key, from its index; the returned list is shared
+        # unless the content is columnar.
+        if key == self.sort_key:
+            # Case-insensitive, memoizing each binary search so repeated
+            # lookups return the same first match the search did.
+            index = self.indexes.setdefault(key, {})
+            value = value.lower()
+            if value not in index:
+                found = self.binary_search_index(value)
+                if self.columnar:
+                    # Rows are rebuilt on access, so only the position of
+                    # the match is kept rather than the rows themselves.
+                    index[value] = found
+                else:
+                    index[value] = [] if found is None else self.get_items_by_index(found)
+            if self.columnar:
+                found = index[value]
+                return [] if found is None else self.get_items_by_index(found)
+            return index[value]
+        if key not in self.indexes:
+            self.indexes[key] = self.build_index(key)
+        index = self.indexes[key]
+        if index is None:
+            return self.linear_search(key, value)
+        try:
+            items = index.get(value, [])
+        except TypeError:
+            return self.linear_search(key, value)
+        if self.columnar:
+            return [self._content[i] for i in items]
+        return items
+
+    def build_index(self, key: str) -> dict | None:
+        # Columnar indexes hold row positions, so no rebuilt row outlives
+        # the lookup that asked for it.
+        index = {}
+        try:
+            if self.columnar:
+                for i, value in enumerate(self.column_values(key)):
+                    index.setdefault(value, []).append(i)
+            else:
+                for item in self._content:
+                    index.setdefault(getattr(item, key), []).append(item)
+        except TypeError:
+            # Unhashable values (lists) are searched linearly instead.
+            return None
+        return index
+
+    def column_values(self, key: str):
+        if isinstance(self._content, ColumnStore):
+            return self._content.column(key)
+        return [getattr(item, key) for item in self._content]
+
     def binary_search(self, value: str) -> list:
-        a, b = 0, len(self.content) - 1
+        index = self.binary_search_index(value)
+        if index is None:
+            return []
+        return self.get_items_by_index(index)
+
+    def binary_search_index(self, value: str) -> int | None:
+        value = value.lower()
+        a, b = 0, len(self.sort_values) - 1
         while a <= b:
             mid = (a + b) // 2
-            if getattr(self.content[mid], self.sort_key).lower() < value.lower():
+            if self.sort_values[mid] < value:
                 a = mid + 1
-            elif getattr(self.content[mid], self.sort_key).lower() > value.lower():
+            elif self.sort_values[mid] > value:
                 b = mid - 1
             else:
-                return self.get_items_by_index(mid)
-        return []
+                return mid
+        return None
 
     def linear_search(self, key: str, value: str) -> list:
         items = []
-        for item in self.content:
+        for item in self._content:
             if getattr(item, key) == value:
                 items.append(item)
         return items
 
     def get_items_by_index(self, index: int) -> list:
         items = []
-        value = getattr(self.content[index], self.sort_key).lower()
-        for i in range(index, len(self.content)):
-            if getattr(self.content[i], self.sort_key).lower() == value:
-                items.append(self.content[i])
+        value = self.sort_values[index]
+        for i in range(index, len(self._content)):
+            if self.sort_values[i] == value:
+                items.append(self._content[i])
             else:
                 break
         for i in range(index - 1, -1, -1):
-            if getattr(self.content[i], self.sort_key).lower() == value:
-                items.append(self.content[i])
+            if self.sort_values[i] == value:
+                items.append(self._content[i])
             else:
                 break
         return items
 
     def __str__(self):
-        return self.content.__str__()
+        return self._content.__str__()
 
     def __repr__(self):
-        return self.content.__repr__()
+        return self._content.__repr__()
 
     def __getitem__(self, item):
-        return self.content[item]
+        return self._content[item]
 
     def __len__(self):
-        return len(self.content)
+        return len(self._content)
@@ -0,0 +1,52 @@
+import os
+import json
+import sqlite3
+
+# Bump when the shape of the stored item info changes.
+INFO_VERSION = 1
+
+
+class ItemInfoCache:
+    """Item info memoized per process and stored in one sqlite file.
+
+    The store remembers the hash of the datasets its entries were built
+    from; opening it with a different hash empties it, so info never
+    outlives the recipes, drops or items it came from.
+    """
+
+    def __init__(self, db_file: str, dataset_hash: str):
+        self.memo = {}
+        self.pending = []
+        self.key = f'{INFO_VERSION}:{dataset_hash}'
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        self.db = sqlite3.connect(db_file)
+        self.db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.db.execute('CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, info TEXT)')
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'dataset'").fetchone()
+        if row is None or row[0] != self.key:
+            self.db.execute('DELETE FROM info')
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('dataset', ?)", (self.key,))
+            self.db.commit()
+
+    def get(self, name: str, build) -> dict:
+        if name in self.memo:
+            return self.memo[name]
+        row = self.db.execute('SELECT info FROM info WHERE name = ?', (name,)).fetchone()
+        if row is not None:
+            text = row[0]
+        else:
+            text = json.dumps(build())
+            self.pending.append((name, text))
+        # Built and stored info come back in the same (JSON) shape.
+        info = self.memo[name] = json.loads(text)
+        return info
+
+    def flush(self, min_pending: int = 1):
+        if len(self.pending) >= min_pending:
+            self.db.executemany('INSERT OR REPLACE INTO info VALUES (?, ?)', self.pending)
+            self.db.commit()
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.db.close()
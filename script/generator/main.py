@@ -1,6 +1,11 @@
+import io
 import json
 import os
 import time
+import glob
+import argparse
+import contextlib
+import multiprocessing
 
 from units.item import Item, Items
 from units.recipe import Recipe, Recipes
@@ -9,7 +14,11 @@ from units.npc import NPC, NPCs
 from units.boss import Boss, Bosses
 from units.table import Table, Tables
 from units.event import Event, Events
-from nodes.item_node import ItemNode, generate_tree, step_by_step
+from nodes.item_node import ItemNode, generate_tree, step_by_step, catalog_order
+from snapshot import load_snapshot, save_snapshot, source_hash
+from item_info_cache import ItemInfoCache
+from guide_writer import GuideWriter, GUIDE_FORMATS
+from asset_manifest import AssetManifest, missing_asset_report
 
 import dataclasses
 
@@ -33,7 +42,30 @@ def sanitize_name(name: str):
     return name_sanitized
 
 
-def main():
+def parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Generate step-by-step item guides.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes generating guides (default: 1)')
+    parser.add_argument('--all', action='store_true',
+                        help='every obtainable item instead of items.txt, skipping incomplete ones')
+    parser.add_argument('--format', choices=GUIDE_FORMATS, default='json',
+                        help='guide file format (default: json)')
+    parser.add_argument('--output', help='guide file (default: guide.<format>)')
+    parser.add_argument('--compact', action='store_true',
+                        help='write guides without indentation')
+    parser.add_argument('--resume', action='store_true',
+                        help='keep the guides already in the output file and skip their items')
+    parser.add_argument('--assets-report', default='missing_assets.json',
+                        help='missing-assets report file (default: missing_assets.json)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='keep drops and recipes column-wise')
+    args = parser.parse_args(args)
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    return args
+
+
+def load_data(columnar: bool = False) -> dict:
     data_path = 'src/data'
 
     data_files = [
@@ -46,14 +78,179 @@ def main():
         (Events, "events.json", "events")
     ]
 
-    data = {}
-    for data_class, data_file, data_name in data_files:
-        data[data_name] = data_class(load_json(os.path.join(data_path, data_file)))
-    data['misc'] = load_json('script/generator/src/misc.json')
-    data['objects'] = load_json('script/generator/src/objects.json')
+    misc_file = 'script/generator/src/misc.json'
+    objects_file = 'script/generator/src/objects.json'
+    # The snapshot is rebuilt whenever the data or the classes built from it change.
+    sources = [os.path.join(data_path, data_file) for _, data_file, _ in data_files]
+    sources += [misc_file, objects_file, 'script/generator/info_list.py', 'script/generator/records.py']
+    sources += sorted(glob.glob('script/generator/units/*.py'))
+    # Drops and Recipes can be kept column-wise, which a snapshot bakes in.
+    snapshot_file = 'src/cache/dataset.columnar.pickle' if columnar else 'src/cache/dataset.pickle'
+
+    data = load_snapshot(snapshot_file, sources)
+    if data is None:
+        data = {}
+        for data_class, data_file, data_name in data_files:
+            content = load_json(os.path.join(data_path, data_file))
+            if data_class in (Drops, Recipes):
+                data[data_name] = data_class(content, columnar=columnar)
+            else:
+                data[data_name] = data_class(content)
+        data['misc'] = load_json(misc_file)
+        data['objects'] = load_json(objects_file)
+        data['object_index'] = {}
+        for entry in data['objects']:
+            data['object_index'].setdefault(entry['object_name'], entry)
+        save_snapshot(snapshot_file, sources, data)
+    info_sources = [
+        os.path.join(data_path, data_file)
+        for data_file in ("items_parsed.json", "drops_parsed.json", "recipes_parsed.json")
+    ]
+    data['info_cache'] = ItemInfoCache('src/cache/item_info.sqlite', source_hash(info_sources))
+    data['assets'] = AssetManifest('src', ['images', 'videos'], 'src/cache/assets.json')
+    return data
+
+
+def generate_guide(item: str, data: dict, generated: set[str]) -> tuple[dict, list, list]:
+    tree = generate_tree(item, data, generated)
+    tree.print_tree()
+    guide = step_by_step(tree)
+    guide_formatted = {}
+    guide_formatted['item'] = item
+    guide_formatted['image'] = f'images/item/{sanitize_name(item)}.png'
+    guide_formatted['video'] = f'videos/show_{sanitize_name(item)}.mp4'
+    guide_formatted['guide'] = []
+    for step in guide:
+        step_formatted = {}
+        step_formatted['item'] = step['item']
+        step_formatted['image'] = step['image']
+        step_formatted['options'] = []
+        for note in step['options']:
+            note_formatted = {}
+            note_formatted['video'] = note.video
+            note_formatted['type'] = note.type
+            note_formatted['content'] = []
+            for content in note.content:
+                note_formatted['content'].append(dataclasses.asdict(content))
+            step_formatted['options'].append(note_formatted)
+        guide_formatted['guide'].append(step_formatted)
+    return guide_formatted, *guide_missing_assets(guide_formatted, data['assets'])
+
+
+def guide_missing_assets(guide: dict, assets: AssetManifest) -> tuple[list, list]:
+    # Missing files in the order they are checked, so the caller's sets
+    # fill up exactly as if it had checked them itself.
+    missing_images = []
+    missing_videos = []
+    if not assets.exists(guide['video']):
+        missing_videos.append(guide['video'])
+    for step in guide['guide']:
+        for option in step['options']:
+            if not assets.exists(option['video']):
+                missing_videos.append(option['video'])
+            for content in option['content']:
+                if not assets.exists(content['note_image']):
+                    missing_images.append(content['note_image'])
+    return missing_images, missing_videos
+
+
+def missing_entry(item: str, images: list, videos: list) -> dict:
+    return {
+        'item': item,
+        # Event steps have no image; that is not a missing asset.
+        'images': [image for image in dict.fromkeys(images) if image is not None],
+        'videos': list(dict.fromkeys(videos))
+    }
+
+
+def try_guide(item: str, data: dict, generated: set[str], skip_errors: bool) -> tuple:
+    # With skip_errors an item whose data is incomplete gets no guide
+    # instead of stopping the whole run.
+    try:
+        return generate_guide(item, data, generated)
+    except ValueError as e:
+        if not skip_errors:
+            raise
+        print(f'Skipping "{item}": {e}')
+        return None, [], []
+
 
-    with open('script/generator/items.txt', 'r') as f:
-        items = f.read().splitlines()
+# Per-process state of the guide workers, set up by init_worker.
+worker_data = None
+worker_generated = None
+worker_skip_errors = False
+
+
+def init_worker(generated: set[str], skip_errors: bool, columnar: bool):
+    # Every worker loads the snapshot the parent has just written and opens
+    # its own connection to the item info store.
+    global worker_data, worker_generated, worker_skip_errors
+    worker_data = load_data(columnar)
+    worker_generated = generated
+    worker_skip_errors = skip_errors
+
+
+def worker_guide(item: str) -> tuple[str, dict, list, list]:
+    # The tree printout is captured so the parent can print it in input order.
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = try_guide(item, worker_data, worker_generated, worker_skip_errors)
+    # Batched so workers do not contend for the store on every item; a
+    # worker's last few entries are simply rebuilt by a later run.
+    worker_data['info_cache'].flush(min_pending=64)
+    return (output.getvalue(), *result)
+
+
+def generate_guides(
+    items: list[str],
+    data: dict,
+    generated: set[str],
+    workers: int,
+    skip_errors: bool = False
+):
+    """Yield (output, guide, missing images, missing videos) per item, in order.
+
+    Items only share the generated seed set, so with several workers they
+    are fanned out to a process pool; each item's printout is replayed by
+    the caller as its result comes in. Skipped items yield a None guide.
+    """
+    if workers <= 1 or len(items) < 2:
+        for item in items:
+            yield ('', *try_guide(item, data, generated, skip_errors))
+        return
+    initargs = (generated, skip_errors, data['drops'].columnar)
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=initargs) as pool:
+        # Neighbouring catalog items share most of their expansions, so
+        # keeping them on one worker keeps its expansion cache warm.
+        chunksize = max(1, min(16, len(items) // (workers * 8)))
+        yield from pool.imap(worker_guide, items, chunksize=chunksize)
+
+
+def main():
+    args = parse_args()
+    data = load_data(columnar=args.columnar)
+    workers = args.workers
+    all_items = args.all
+    try:
+        writer = GuideWriter(
+            args.output or f'guide.{args.format}',
+            args.format,
+            compact=args.compact,
+            resume=args.resume
+        )
+    except ValueError as e:
+        raise SystemExit(f'error: {e}')
+
+    if all_items:
+        # The whole catalog, dependencies first so their expansions are
+        # cached by the time the items that use them are generated.
+        items = catalog_order(data)
+    else:
+        with open('script/generator/items.txt', 'r') as f:
+            items = f.read().splitlines()
+    if writer.done:
+        print(f'Resuming after {writer.count} guides in {writer.path}')
+        items = [item for item in items if item not in writer.done]
 
     missing_images = set()
     missing_videos = set()
@@ -64,41 +261,31 @@ def main():
         "Mythril Anvil",
         "Adamantite Forge"
     ])
-    info = []
+    written = 0
+    missing = []
+    # Resumed guides are checked again, so the report covers the whole file
+    # and reflects the assets added since they were written.
+    for guide in writer.existing:
+        images, videos = guide_missing_assets(guide, data['assets'])
+        missing_images.update(images)
+        missing_videos.update(videos)
+        missing.append(missing_entry(guide['item'], images, videos))
+    writer.existing.clear()
+    start = time.time()
 
-    for item in items:
-        tree = generate_tree(item, data, generated)
-        tree.print_tree()
+    for output, guide_formatted, item_images, item_videos in generate_guides(
+        items, data, generated, workers, skip_errors=all_items
+    ):
+        print(output, end='')
+        if guide_formatted is None:
+            continue
         prev_missing_images = missing_images.copy()
         prev_missing_videos = missing_videos.copy()
-        to_clean = [tree]
-        guide = step_by_step(tree)
-        guide_formatted = {}
-        guide_formatted['item'] = item
-        guide_formatted['image'] = f'images/item/{sanitize_name(item)}.png'
-        guide_formatted['video'] = f'videos/show_{sanitize_name(item)}.mp4'
-        if not os.path.isfile(f'src/{guide_formatted["video"]}'):
-            missing_videos.add(guide_formatted["video"])
-        guide_formatted['guide'] = []
-        for step in guide:
-            step_formatted = {}
-            step_formatted['item'] = step['item']
-            step_formatted['image'] = step['image']
-            step_formatted['options'] = []
-            for note in step['options']:
-                note_formatted = {}
-                note_formatted['video'] = note.video
-                note_formatted['type'] = note.type
-                if not os.path.isfile(f'src/{note.video}'):
-                    missing_videos.add(note.video)
-                note_formatted['content'] = []
-                for content in note.content:
-                    note_formatted['content'].append(dataclasses.asdict(content))
-                    if not os.path.isfile(f'src/{content.note_image}'):
-                        missing_images.add(content.note_image)
-                step_formatted['options'].append(note_formatted)
-            guide_formatted['guide'].append(step_formatted)
-        info.append(guide_formatted)
+        missing_images.update(item_images)
+        missing_videos.update(item_videos)
+        writer.write(guide_formatted)
+        written += 1
+        missing.append(missing_entry(guide_formatted['item'], item_images, item_videos))
         new_missing_images = missing_images - prev_missing_images
         new_missing_videos = missing_videos - prev_missing_videos
         for video in new_missing_videos:
@@ -111,8 +298,17 @@ def main():
     for video in missing_videos:
         print(f'Missing video: {video}')
 
-    with open('guide.json', 'w') as f:
-        json.dump(info, f, indent=4)
+    if all_items:
+        elapsed = time.time() - start
+        # Skipped items fail early, so only generated guides count towards
+        # the rate.
+        print(f'{written} guides generated, {len(items) - written} items skipped '
+              f'in {elapsed:.1f}s ({written / elapsed:.1f} guides/sec)')
+
+    writer.close()
+    data['info_cache'].close()
+    with open(args.assets_report, 'w') as f:
+        json.dump(missing_asset_report(missing), f, indent=4)
 
     # missing_images = list(missing_images)
     # for image in missing_images:
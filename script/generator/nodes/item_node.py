@@ -1,11 +1,22 @@
 import math
-import os
-import json
 import dataclasses
 
 from node import Node, NodeType, ChildGroup, NodeContent, GroupType, TextNote
 
 
+@dataclasses.dataclass
+class ItemEdge:
+    """An item inside an expansion template, standing in for its ItemNode.
+
+    Recipe ingredients scale with the expanded item's count: the node gets
+    `count` per craft, with `per_craft` of the item made by each craft.
+    """
+    item_name: str
+    count: int = 1
+    per_craft: int | None = None
+    check_loop: bool = False
+
+
 class ItemNode(Node):
     def __init__(
         self,
@@ -31,6 +42,18 @@ class ItemNode(Node):
         self.history = history or []
 
     def init_children(self):
+        # Every occurrence of an item expands the same way up to counts and
+        # loop checks, so the expansion is built once per item (shared by
+        # all trees generated from this data) and materialized per node.
+        self.children = self.materialize(self.cached_expansion())
+
+    def cached_expansion(self) -> list:
+        expansions = self.data.setdefault('expansions', {})
+        if self.item_name not in expansions:
+            expansions[self.item_name] = self.expansion()
+        return expansions[self.item_name]
+
+    def expansion(self) -> list:
         self.children = []
         if not self.children:
             self.init_obtain()
@@ -40,17 +63,43 @@ class ItemNode(Node):
             self.init_drops()
         if not self.children:
             self.init_vendors()
+        template, self.children = self.children, []
+        return template
+
+    def materialize(self, template: list) -> list:
+        children = []
+        for child in template:
+            if isinstance(child, ChildGroup):
+                group = ChildGroup(child.group_type)
+                group.elements = self.materialize(child.elements)
+                children.append(group)
+            elif isinstance(child, ItemEdge):
+                if (node := self.edge_node(child)) is not None:
+                    children.append(node)
+            else:
+                node = Node(child.content, child.node_type, child.count)
+                node.children = self.materialize(child.children)
+                children.append(node)
+        return children
+
+    def edge_node(self, edge: ItemEdge):
+        if edge.check_loop and edge.item_name in self.history:
+            print(f'Loop detected: {self.history}')
+            return None
+        count = edge.count
+        if edge.per_craft is not None:
+            count *= math.ceil(self.count / edge.per_craft)
+        return ItemNode(
+            item_name=edge.item_name,
+            data=self.data,
+            count=count,
+            history=self.history + [edge.item_name]
+        )
 
     def get_item_info(self, item_name: str, data: dict):
-        cache_file = f'src/info/{item_name}.json'
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        else:
-            item_info = self.get_item_info_from_data(item_name, data)
-            with open(cache_file, 'w') as f:
-                json.dump(item_info, f, indent=4)
-            return item_info
+        if (cache := data.get('info_cache')) is None:
+            return self.get_item_info_from_data(item_name, data)
+        return cache.get(item_name, lambda: self.get_item_info_from_data(item_name, data))
 
     def get_item_info_from_data(self, item_name: str, data: dict):
         item_info = {}
@@ -90,7 +139,6 @@ class ItemNode(Node):
             recipes = [recipes[0]]
         for recipe in recipes:
             recipe_group = ChildGroup(GroupType.RECIPE)
-            craft_count = math.ceil(self.count / recipe['recipe_result_amount'])
 
             stations = recipe['recipe_station']
             station_content = []
@@ -105,27 +153,17 @@ class ItemNode(Node):
             for station in stations:
                 if self.data['items'].get_item('item_name', station) is None:
                     continue
-                station_item_node = ItemNode(
-                    item_name=station,
-                    data=self.data,
-                    count=1,
-                    history=self.history + [station]
-                )
-                station_group.elements.append(station_item_node)
+                station_group.elements.append(ItemEdge(station))
             station_node.children.append(station_group)
             recipe_group.elements.append(station_node)
 
             for ingredient in recipe['recipe_ingredients']:
-                if ingredient['item_name'] in self.history:
-                    print(f'Loop detected: {self.history}')
-                    continue
-                ingredient_item_node = ItemNode(
+                recipe_group.elements.append(ItemEdge(
                     item_name=ingredient['item_name'],
-                    data=self.data,
-                    count=ingredient['amount'] * craft_count,
-                    history=self.history + [ingredient['item_name']]
-                )
-                recipe_group.elements.append(ingredient_item_node)
+                    count=ingredient['amount'],
+                    per_craft=recipe['recipe_result_amount'],
+                    check_loop=True
+                ))
             self.children.append(recipe_group)
 
     def init_drops(self):
@@ -155,28 +193,23 @@ class ItemNode(Node):
         return chest_node
 
     def enemy_node(self, enemy_name: str):
-        is_boss = False
-        boss_data = None
-        for boss in self.data['bosses']:
-            if boss.boss_name == enemy_name:
-                is_boss = True
-                boss_data = boss
-                break
-        is_event = False
-        event_data = None
-        for event in self.data['events']:
-            for enemy_group in event.event_enemies:
-                if enemy_name in enemy_group.enemy_group_enemies:
-                    is_event = True
-                    event_data = event
-                    break
-        if is_boss and not is_event:
+        boss_data = self.data['bosses'].get_boss(enemy_name)
+        # A full scan over the events kept the last one containing the
+        # enemy, so the index does too.
+        events = self.data['events'].get_events(enemy_name)
+        event_data = events[-1] if events else None
+        if boss_data is not None and event_data is None:
             return self.boss_node(boss_data=boss_data)
-        elif not is_boss and not is_event:
+        elif boss_data is None and event_data is None:
             return self.npc_node(npc_name=enemy_name)
-        elif is_event:
+        else:
             return self.event_node(event_data=event_data, enemy_name=enemy_name)
 
+    def get_object(self, object_name: str) -> dict:
+        if (entry := self.data['object_index'].get(object_name)) is None:
+            raise ValueError(f'Object "{object_name}" not found')
+        return entry
+
     def boss_node(self, boss_data: dict):
         boss_node = self.npc_node(npc_name=boss_data.boss_name)
         summon_type = boss_data.boss_summon_source_type.value
@@ -185,43 +218,27 @@ class ItemNode(Node):
         summon_group = ChildGroup(GroupType.SUMMON)
 
         if summon_type == 'Item':
-            summon_group.elements.append(ItemNode(
+            summon_group.elements.append(ItemEdge(
                 item_name=summon_source[0],
-                data=self.data,
-                count=boss_data.boss_summon_count,
-                history=self.history + [summon_source[0]]
+                count=boss_data.boss_summon_count
             ))
         elif summon_type == 'Object':
-            objects_data = self.data['objects']
-            for entry in objects_data:
-                if entry['object_name'] == summon_source[0]:
-                    objects_data = entry
-                    break
-            else:
-                raise ValueError(f'Object "{summon_source[0]}" not found')
+            objects_data = self.get_object(summon_source[0])
             object_content = NodeContent(
                 summon_source[0], objects_data['object_image']
             )
             summon_group.elements.append(Node([object_content], NodeType.OBJECT, 1))
         elif summon_type == 'Item and Object':
-            objects_data = self.data['objects']
-            for entry in objects_data:
-                if entry['object_name'] == summon_source[1]:
-                    objects_data = entry
-                    break
-            else:
-                raise ValueError(f'Object "{summon_source[1]}" not found')
+            objects_data = self.get_object(summon_source[1])
             object_content = NodeContent(
                 summon_source[1], objects_data['object_image']
             )
-            summon_node = Node([object_content], NodeType.OBJECT, 1)
-            summon_node.children.append(ItemNode(
+            # Same shape as event summons: the object, then the item used at it.
+            summon_group.elements.append(Node([object_content], NodeType.OBJECT, 1))
+            summon_group.elements.append(ItemEdge(
                 item_name=summon_source[0],
-                data=self.data,
-                count=boss_data.boss_summon_count,
-                history=self.history + [summon_source[0]]
+                count=boss_data.boss_summon_count
             ))
-            summon_group.elements.append(summon_node)
         elif summon_type == 'Enemy':
             for enemy_name in summon_source:
                 summon_group.elements.append(self.enemy_node(enemy_name=enemy_name))
@@ -264,44 +281,22 @@ class ItemNode(Node):
         event_node.children.append(summon_group)
 
         if summon_type == 'Item':
-            summon_node = ItemNode(
-                item_name=summon_source[0],
-                data=self.data,
-                count=1,
-                history=self.history + [summon_source[0]]
-            )
+            summon_node = ItemEdge(summon_source[0])
             summon_group.elements.append(summon_node)
         elif summon_type == 'Object':
-            objects_data = self.data['objects']
-            for entry in objects_data:
-                if entry['object_name'] == summon_source[0]:
-                    objects_data = entry
-                    break
-            else:
-                raise ValueError(f'Object "{summon_source[0]}" not found')
+            objects_data = self.get_object(summon_source[0])
             object_content = NodeContent(
                 summon_source[0], objects_data['object_image']
             )
             summon_node = Node([object_content], NodeType.OBJECT, 1)
             summon_group.elements.append(summon_node)
         elif summon_type == 'Item and Object':
-            objects_data = self.data['objects']
-            for entry in objects_data:
-                if entry['object_name'] == summon_source[1]:
-                    objects_data = entry
-                    break
-            else:
-                raise ValueError(f'Object "{summon_source[1]}" not found')
+            objects_data = self.get_object(summon_source[1])
             object_content = NodeContent(
                 summon_source[1], objects_data['object_image']
             )
             object_node = Node([object_content], NodeType.OBJECT, 1)
-            item_node = ItemNode(
-                item_name=summon_source[0],
-                data=self.data,
-                count=1,
-                history=self.history + [summon_source[0]]
-            )
+            item_node = ItemEdge(summon_source[0])
             summon_group.elements.append(object_node)
             summon_group.elements.append(item_node)
         elif summon_type == 'Enemy':
@@ -379,6 +374,56 @@ def generate_tree(item_name: str, data: dict, generated_: set[str]):
             to_clean.extend(child_group.elements)
     return root
 
+def edge_names(template: list) -> list[str]:
+    names = []
+    for child in template:
+        if isinstance(child, ItemEdge):
+            names.append(child.item_name)
+        elif isinstance(child, ChildGroup):
+            names.extend(edge_names(child.elements))
+        else:
+            names.extend(edge_names(child.children))
+    return names
+
+
+def catalog_order(data: dict) -> list[str]:
+    """Every craftable or obtainable item, after the items its tree expands.
+
+    A depth-first walk over the expansion templates, so ingredients,
+    stations and summon items come before the items that need them and
+    their expansions are already cached when those are generated. Loops
+    are cut where they close.
+    """
+    replacements = data['misc']['name_replacements']
+    order = []
+    seen = set()
+    for root in data['items'].content:
+        stack = [(root.item_name, False)]
+        while stack:
+            item_name, done = stack.pop()
+            if done:
+                order.append(item_name)
+                continue
+            item_name = replacements.get(item_name, item_name)
+            if item_name in seen:
+                continue
+            seen.add(item_name)
+            if data['items'].get_item('item_name', item_name) is None:
+                continue
+            node = ItemNode(item_name, data)
+            info = node.item_info
+            if not (info['recipes'] or info['drops'] or info['vendors'] or info['obtainable']):
+                continue
+            stack.append((item_name, True))
+            try:
+                dependencies = edge_names(node.cached_expansion())
+            except ValueError:
+                # Reported when the item's own guide is generated.
+                dependencies = []
+            for dependency in reversed(dependencies):
+                stack.append((dependency, False))
+    return order
+
 def sanitize_name(name: str):
     name_sanitized = ''
     for char in name:
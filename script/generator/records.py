@@ -0,0 +1,69 @@
+import sys
+import dataclasses
+from array import array
+
+# Equal immutable values seen while loading (name tuples, frozen records),
+# so every record holding one points at the same object. Pickling keeps the
+# sharing, so snapshots load with it too.
+shared_values = {}
+
+
+def intern_name(name: str | None) -> str | None:
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+def intern_names(names: list[str] | None) -> tuple[str, ...] | None:
+    if names is None:
+        return None
+    return shared(tuple(intern_name(name) for name in names))
+
+
+def shared(value):
+    # Keyed by repr as well, since 1 == 1.0 but a drop rate of 1.0 must not
+    # turn into the amount 1 of some other record.
+    return shared_values.setdefault((repr(value), value), value)
+
+
+class ColumnStore:
+    """Records of one slotted dataclass, stored as one column per field.
+
+    Columns of plain ints or floats are packed into arrays. Records are
+    rebuilt on access, so two reads of a row are equal but not identical.
+    """
+
+    def __init__(self, record_class: type, records: list):
+        self.record_class = record_class
+        self.fields = [field.name for field in dataclasses.fields(record_class)]
+        self.length = len(records)
+        self.columns = [
+            self.pack([getattr(record, field) for record in records])
+            for field in self.fields
+        ]
+
+    @staticmethod
+    def pack(values: list):
+        for typecode, cast in (('q', int), ('d', float)):
+            if all(type(value) is cast for value in values):
+                try:
+                    return array(typecode, values)
+                except OverflowError:
+                    break
+        return values
+
+    def column(self, field: str):
+        return self.columns[self.fields.index(field)]
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        return self.record_class(*(column[index] for column in self.columns))
+
+    def __iter__(self):
+        for row in zip(*self.columns):
+            yield self.record_class(*row)
+
+    def __repr__(self):
+        return list(self).__repr__()
@@ -0,0 +1,43 @@
+import os
+import pickle
+import hashlib
+
+# Bump when the layout of the pickled dataset changes in a way the hashed
+# sources would not reveal.
+SNAPSHOT_VERSION = 1
+
+
+def source_hash(paths: list[str]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def load_snapshot(snapshot_file: str, sources: list[str]) -> dict | None:
+    """The dataset pickled by save_snapshot, if it was built from these sources.
+
+    The header is a separate pickle so a stale snapshot is rejected without
+    unpickling the data behind it.
+    """
+    if not os.path.exists(snapshot_file):
+        return None
+    with open(snapshot_file, 'rb') as f:
+        try:
+            header = pickle.load(f)
+            if header != {'version': SNAPSHOT_VERSION, 'sources': source_hash(sources)}:
+                return None
+            return pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+
+def save_snapshot(snapshot_file: str, sources: list[str], data: dict):
+    os.makedirs(os.path.dirname(snapshot_file), exist_ok=True)
+    temp_file = f"{snapshot_file}.part"
+    with open(temp_file, 'wb') as f:
+        pickle.dump({'version': SNAPSHOT_VERSION, 'sources': source_hash(sources)}, f)
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file, snapshot_file)
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from enum import StrEnum
 
 from info_list import InfoList
+from records import intern_name
 
 
 class SummonSourceType(StrEnum):
@@ -14,7 +15,7 @@ class SummonSourceType(StrEnum):
     EVENT = "Event"
 
 
-@dataclass
+@dataclass(slots=True)
 class Boss:
     boss_name: str = None
     boss_image: str = None
@@ -24,7 +25,7 @@ class Boss:
     boss_prerequisite: list[str] = None
 
     def init_from_data(self, data: dict):
-        self.boss_name = data["boss_name"]
+        self.boss_name = intern_name(data["boss_name"])
         self.boss_image = data["boss_icon"]
         summon_source_type = data["boss_summon_type"].lower()
         for summon_source_type_enum in SummonSourceType:
@@ -51,3 +52,16 @@ class Bosses(InfoList):
             boss.init_from_data(boss_data)
             bosses.append(boss)
         super().__init__(bosses, "boss_name")
+        self.by_name()
+
+    def by_name(self) -> dict[str, Boss]:
+        # Exact names, first boss in sort order wins.
+        def build():
+            index = {}
+            for boss in self.content:
+                index.setdefault(boss.boss_name, boss)
+            return index
+        return self.derived_index('by_name', build)
+
+    def get_boss(self, name: str) -> Boss | None:
+        return self.by_name().get(name)
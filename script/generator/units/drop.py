@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from enum import StrEnum
 
 from info_list import InfoList
+from records import intern_name, shared
 
 
 class DropSourceType(StrEnum):
@@ -9,14 +10,19 @@ class DropSourceType(StrEnum):
     CHEST = "Chest"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DropInfo:
     value_normal: tuple[float, float] = None
     value_expert: tuple[float, float] = None
     value_master: tuple[float, float] = None
 
 
-@dataclass
+def drop_info(values: list) -> DropInfo:
+    # Most drops share a handful of amounts and chances.
+    return shared(DropInfo(*(tuple(value) for value in values[:3])))
+
+
+@dataclass(slots=True)
 class Drop:
     drop_source: str = None
     drop_source_type: DropSourceType = None
@@ -25,26 +31,18 @@ class Drop:
     drop_chance: DropInfo | None = None
 
     def init_from_data(self, data: dict):
-        self.drop_source = data["drop_source"]
+        self.drop_source = intern_name(data["drop_source"])
         source_type = data["drop_source_type"].lower()
         for source_type_enum in DropSourceType:
             if source_type_enum.value.lower() == source_type:
                 self.drop_source_type = source_type_enum
-        self.drop_item = data["drop_item"]
+        self.drop_item = intern_name(data["drop_item"])
         if data["drop_amount"]:
-            self.drop_amount = DropInfo(
-                data["drop_amount"][0],
-                data["drop_amount"][1],
-                data["drop_amount"][2]
-            )
+            self.drop_amount = drop_info(data["drop_amount"])
         else:
             self.drop_amount = None
         if data["drop_rate"]:
-            self.drop_chance = DropInfo(
-                data["drop_rate"][0],
-                data["drop_rate"][1],
-                data["drop_rate"][2]
-            )
+            self.drop_chance = drop_info(data["drop_rate"])
         else:
             self.drop_chance = None
 
@@ -63,10 +61,10 @@ class Drop:
 
 
 class Drops(InfoList):
-    def __init__(self, content: list[dict]):
+    def __init__(self, content: list[dict], columnar: bool = False):
         drops = []
         for drop_data in content:
             drop = Drop()
             drop.init_from_data(drop_data)
             drops.append(drop)
-        super().__init__(drops, "drop_item")
+        super().__init__(drops, "drop_item", columnar)
@@ -4,7 +4,7 @@ from enum import StrEnum
 from info_list import InfoList
 
 
-@dataclass
+@dataclass(slots=True)
 class EventEnemyGroup:
     enemy_group_prereq: list[str] = None
     enemy_group_enemies: list[str] = None
@@ -18,7 +18,7 @@ class EventSummonType(StrEnum):
     ENEMY = "Enemy"
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     event_name: str = None
     event_summon_type: EventSummonType = None
@@ -57,3 +57,20 @@ class Events(InfoList):
             event.init_from_data(event_data)
             events.append(event)
         super().__init__(events, "event_name")
+        self.by_enemy()
+
+    def by_enemy(self) -> dict[str, list[Event]]:
+        # Every event an enemy appears in, in sort order.
+        def build():
+            index = {}
+            for event in self.content:
+                for enemy_group in event.event_enemies:
+                    for enemy in enemy_group.enemy_group_enemies:
+                        events = index.setdefault(enemy, [])
+                        if not events or events[-1] is not event:
+                            events.append(event)
+            return index
+        return self.derived_index('by_enemy', build)
+
+    def get_events(self, enemy_name: str) -> list[Event]:
+        return self.by_enemy().get(enemy_name, [])
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from enum import StrEnum
 
 from info_list import InfoList
+from records import intern_name, shared
 from node import Node, NodeType
 
 
@@ -45,13 +46,13 @@ class Vendor(StrEnum):
     ZOOLOGIST = "Zoologist"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Price:
     amount: int
     currency: Currency
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     page_url: str | None = None
     page_title: str = None
@@ -85,7 +86,7 @@ class Item:
         self.page_title = data.get("page_title")
         self.page_id = data.get("page_id")
         self.items_id = data.get("items_id")
-        self.item_name = data.get("item_name")
+        self.item_name = intern_name(data.get("item_name"))
         self.item_internal_name = data.get("item_internal_name")
         self.item_image = data.get("item_image")
         self.item_image_placed = data.get("item_image_placed")
@@ -107,13 +108,13 @@ class Item:
             currency = currency.lower()
             for currency_enum in Currency:
                 if currency_enum.value.lower() == currency:
-                    self.item_buy_price = Price(amount, currency_enum)
+                    self.item_buy_price = shared(Price(amount, currency_enum))
         if data.get("item_sell_price") is not None:
             amount, currency = data.get("item_sell_price")
             currency = currency.lower()
             for currency_enum in Currency:
                 if currency_enum.value.lower() == currency:
-                    self.item_sell_price = Price(amount, currency_enum)
+                    self.item_sell_price = shared(Price(amount, currency_enum))
         self.item_axe_power = data.get("item_axe_power")
         self.item_pickaxe_power = data.get("item_pickaxe_power")
         self.item_hammer_power = data.get("item_hammer_power")
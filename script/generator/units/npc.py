@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 
 from info_list import InfoList
+from records import intern_name
 
 
-@dataclass
+@dataclass(slots=True)
 class NPC:
     npc_name: str = None
     npc_image: str = None
@@ -11,7 +12,7 @@ class NPC:
     npc_environment: list[str] = None
 
     def init_from_data(self, data: dict):
-        self.npc_name = data["npc_name"]
+        self.npc_name = intern_name(data["npc_name"])
         self.npc_image = data["npc_image"]
         self.npc_hardmode = data["npc_hardmode"]
         self.npc_environment = data["npc_environment"]
@@ -1,28 +1,31 @@
 from dataclasses import dataclass
 
 from info_list import InfoList
+from records import intern_name, intern_names, shared
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RecipeItem:
     item_name: str
     amount: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     recipe_result_item: str = None
     recipe_result_amount: int = None
     recipe_ingredients: list[RecipeItem] = None
-    recipe_station: list[str] = None
+    recipe_station: tuple[str, ...] = None
 
     def init_from_data(self, data: dict):
-        self.recipe_result_item = data["recipe_result"][0]
+        self.recipe_result_item = intern_name(data["recipe_result"][0])
         self.recipe_result_amount = data["recipe_result"][1]
         self.recipe_ingredients = []
         for ingredient in data["recipe_ingredients"]:
-            self.recipe_ingredients.append(RecipeItem(ingredient[0], ingredient[1]))
-        self.recipe_station = data["recipe_station"]
+            self.recipe_ingredients.append(
+                shared(RecipeItem(intern_name(ingredient[0]), ingredient[1]))
+            )
+        self.recipe_station = intern_names(data["recipe_station"])
 
     def __str__(self):
         string = '(RECIPE) '
@@ -40,10 +43,10 @@ class Recipe:
 
 
 class Recipes(InfoList):
-    def __init__(self, content: list[dict]):
+    def __init__(self, content: list[dict], columnar: bool = False):
         recipes = []
         for recipe_data in content:
             recipe = Recipe()
             recipe.init_from_data(recipe_data)
             recipes.append(recipe)
-        super().__init__(recipes, "recipe_result_item")
+        super().__init__(recipes, "recipe_result_item", columnar)
@@ -1,15 +1,16 @@
 from dataclasses import dataclass
 
 from info_list import InfoList
+from records import intern_name
 
 
-@dataclass
+@dataclass(slots=True)
 class Table:
     table_name: str = None
     table_image: str = None
 
     def init_from_data(self, data: dict):
-        self.table_name = data["table_name"]
+        self.table_name = intern_name(data["table_name"])
         self.table_image = data["table_image"]
 
     def __str__(self):
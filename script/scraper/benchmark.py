@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import time
+
+from bs4 import BeautifulSoup as soup
+
+from cell import CellParser
+from extract import cell_stat, difficulty_values, value_range
+from scrapers.itemscraper import ItemScraper
+from scrapers.soup_itemscraper import SoupItemScraper
+from scrapers.recipescraper import RecipeScraper
+from scrapers.dropscraper import DropScraper
+from scrapers.npcscraper import NpcScraper
+
+
+def load_raw(data_folder: str, table: str) -> list[dict] | None:
+    data_file = os.path.join(data_folder, f"{table}_raw.json")
+    if not os.path.exists(data_file):
+        return None
+    with open(data_file, 'r') as f:
+        return json.load(f)
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def bench_cells(rows: list[dict]):
+    cells = [value for row in rows for value in row.values() if '<' in value]
+    parser = CellParser()
+    soup_time = timed(lambda: [soup(value, 'html.parser') for value in cells])
+    cell_time = timed(lambda: [parser.parse(value) for value in cells])
+    print(f"  {len(cells)} html cells: soup {soup_time*1e6/len(cells):.1f}us/cell, "
+          f"cell {cell_time*1e6/len(cells):.1f}us/cell ({soup_time/cell_time:.1f}x)")
+
+
+# Numeric columns per table, with whether they hold per-difficulty ranges.
+NUMBER_FIELDS = {
+    'Items': [('damage', int, False), ('defense', int, False), ('velocity', float, False),
+              ('knockback', float, False), ('stack', int, False)],
+    'Drops': [('quantity', int, True), ('rate', float, True)]
+}
+
+
+def split_range(text: str, cast: type) -> tuple | None:
+    # The per-character filtering the scrapers used before extract.py.
+    keep = (lambda c: c.isdigit()) if cast is int else (lambda c: c.isdigit() or c == '.')
+    text = text.split(' ')[0].strip(' ~').replace('–', '-')
+    if '-' in text:
+        low, high = text.split('-')[:2]
+        low = ''.join(c for c in low if keep(c))
+        high = ''.join(c for c in high if keep(c))
+        return (cast(low), cast(high)) if low and high else None
+    value = ''.join(c for c in text if keep(c))
+    return (cast(value), cast(value)) if value else None
+
+
+def bench_numbers(rows: list[dict], fields: list[tuple]):
+    parser = CellParser()
+    for field, cast, ranged in fields:
+        cells = [parser.parse(row[field]) for row in rows if row.get(field)]
+        if not cells:
+            continue
+        if ranged:
+            extract_time = timed(lambda: [difficulty_values(cell, cast) for cell in cells])
+            texts = [cell.get_text(strip=True, separator='/').split('/')[0] for cell in cells]
+            split_time = timed(lambda: [split_range(text, cast) for text in texts])
+            regex_time = timed(lambda: [value_range(text, cast) for text in texts])
+            print(f"  {field}: {extract_time*1e6/len(cells):.1f}us/cell, ranges: "
+                  f"split {split_time*1e6/len(texts):.2f}us, regex {regex_time*1e6/len(texts):.2f}us")
+        else:
+            extract_time = timed(lambda: [cell_stat(cell, cast) for cell in cells])
+            print(f"  {field}: {extract_time*1e6/len(cells):.1f}us/cell")
+
+
+def bench_parse(scraper_class, data_folder: str, cache_folder: str):
+    scraper = scraper_class(None, None, data_folder, cache_folder)
+    parse_time = timed(scraper.parse)
+    print(f"  parse: {parse_time*1000:.0f}ms")
+    workers = os.cpu_count() or 1
+    if workers > 1:
+        scraper = scraper_class(None, None, data_folder, cache_folder, parse_workers=workers)
+        parallel_time = timed(scraper.parse)
+        print(f"  parse ({workers} workers): {parallel_time*1000:.0f}ms "
+              f"({parse_time/parallel_time:.1f}x)")
+
+
+def bench_items(data_folder: str, cache_folder: str) -> bool:
+    # The BeautifulSoup parser and the current one on the same rows; both
+    # must serialize to the same Items_parsed.json.
+    old = SoupItemScraper(None, None, data_folder, cache_folder)
+    new = ItemScraper(None, None, data_folder, cache_folder)
+    rows = list(new.get_data())
+    parsed = {}
+    times = {}
+    for name, scraper in (('soup', old), ('cell', new)):
+        start = time.perf_counter()
+        data = scraper.finalize(scraper.parse_rows(rows))
+        times[name] = time.perf_counter() - start
+        parsed[name] = json.dumps(data, indent=4)
+    same = parsed['soup'] == parsed['cell']
+    print(f"  parse {len(rows)} items: soup {times['soup']*1000:.0f}ms, "
+          f"cell {times['cell']*1000:.0f}ms ({times['soup']/times['cell']:.1f}x), "
+          f"output {'identical' if same else 'DIFFERS'}")
+    return same
+
+
+def main():
+    # The raw data folder defaults to the scrapers' own.
+    data_folder = sys.argv[1] if len(sys.argv) > 1 else "src/data/"
+    cache_folder = "src/cache/"
+    scrapers = [
+        (ItemScraper, 'Items'),
+        (RecipeScraper, 'Recipes'),
+        (DropScraper, 'Drops'),
+        (NpcScraper, 'NPCs')
+    ]
+    ok = True
+    for scraper_class, table in scrapers:
+        rows = load_raw(data_folder, table)
+        if rows is None:
+            print(f"{table}: no raw data, skipped")
+            continue
+        print(f"{table}: {len(rows)} rows")
+        bench_cells(rows)
+        if table in NUMBER_FIELDS:
+            bench_numbers(rows, NUMBER_FIELDS[table])
+        if scraper_class is ItemScraper:
+            ok = bench_items(data_folder, cache_folder) and ok
+        bench_parse(scraper_class, data_folder, cache_folder)
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
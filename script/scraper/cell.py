@@ -0,0 +1,184 @@
+import re
+from html.parser import HTMLParser
+
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+# Attributes BeautifulSoup treats as whitespace-separated lists, which it
+# normalizes to single spaces when serializing.
+LIST_ATTRS = {'class', 'accesskey', 'dropzone'}
+TAG_LIST_ATTRS = {
+    'a': {'rel', 'rev'},
+    'link': {'rel', 'rev'},
+    'td': {'headers'},
+    'th': {'headers'},
+    'area': {'rel'}
+}
+ESCAPE_RE = re.compile(r'[&<>]')
+ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;'}
+
+
+class Comment(str):
+    pass
+
+
+def escape(text: str) -> str:
+    return ESCAPE_RE.sub(lambda m: ESCAPES[m.group()], text)
+
+
+def quote_attr(name: str, key: str, value: str) -> str:
+    if key in LIST_ATTRS or key in TAG_LIST_ATTRS.get(name, ()):
+        value = ' '.join(value.split())
+    value = escape(value)
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', '&quot;') + '"'
+        return "'" + value + "'"
+    return '"' + value + '"'
+
+
+class Element:
+    __slots__ = ('name', 'attrs', 'children')
+
+    def __init__(self, name: str | None, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.children = []
+
+    def __getitem__(self, key: str) -> str:
+        return self.attrs[key]
+
+    def get(self, key: str, default=None):
+        return self.attrs.get(key, default)
+
+    def classes(self) -> list[str]:
+        return self.attrs.get('class', '').split()
+
+    def elements(self):
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Element):
+                yield node
+                stack.extend(reversed(node.children))
+
+    def strings(self):
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Element):
+                stack.extend(reversed(node.children))
+            elif not isinstance(node, Comment):
+                yield node
+
+    def decode_contents(self) -> str:
+        # Serializes like BeautifulSoup's decode_contents() with the minimal
+        # formatter, so cells read back from a stream match the soup path.
+        parts = []
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Element):
+                attrs = ''.join(
+                    f' {key}={quote_attr(node.name, key, value)}'
+                    for key, value in node.attrs.items()
+                )
+                if node.name in VOID_TAGS and not node.children:
+                    parts.append(f'<{node.name}{attrs}/>')
+                    continue
+                parts.append(f'<{node.name}{attrs}>')
+                stack.append((node.name,))
+                stack.extend(reversed(node.children))
+            elif isinstance(node, Comment):
+                parts.append(f'<!--{node}-->')
+            elif isinstance(node, tuple):
+                parts.append(f'</{node[0]}>')
+            else:
+                parts.append(escape(node))
+        return ''.join(parts)
+
+    def select_one(self, name: str, class_name: str = None) -> 'Element | None':
+        for element in self.elements():
+            if element.name != name:
+                continue
+            if class_name is None or class_name in element.classes():
+                return element
+        return None
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        if strip:
+            return separator.join(s.strip() for s in self.strings() if s.strip())
+        return separator.join(self.strings())
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+
+class CellParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = None
+        self.stack = []
+        # Consecutive data events form one string until any markup event,
+        # matching how BeautifulSoup splits NavigableStrings.
+        self.text_open = False
+
+    def parse(self, markup: str) -> Element:
+        self.reset()
+        self.root = Element(None, {})
+        self.stack = [self.root]
+        self.text_open = False
+        self.feed(markup)
+        self.close()
+        return self.root
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str]]):
+        self.text_open = False
+        element = Element(tag, {k: '' if v is None else v for k, v in attrs})
+        self.stack[-1].children.append(element)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str]]):
+        self.text_open = False
+        element = Element(tag, {k: '' if v is None else v for k, v in attrs})
+        self.stack[-1].children.append(element)
+
+    def handle_endtag(self, tag: str):
+        self.text_open = False
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].name == tag:
+                del self.stack[i:]
+                return
+
+    def handle_comment(self, data: str):
+        self.text_open = False
+        self.stack[-1].children.append(Comment(data))
+
+    def handle_data(self, data: str):
+        children = self.stack[-1].children
+        if self.text_open:
+            children[-1] += data
+        else:
+            children.append(data)
+            self.text_open = True
+
+
+class Row:
+    """Raw scraped row whose HTML cells are tokenized once, on first use."""
+
+    def __init__(self, row: dict, parser: CellParser = None):
+        self.row = row
+        self.parser = parser or CellParser()
+        self.cells = {}
+
+    def __getitem__(self, field: str) -> str:
+        return self.row[field]
+
+    def cell(self, field: str) -> Element:
+        if field not in self.cells:
+            self.cells[field] = self.parser.parse(self.row[field])
+        return self.cells[field]
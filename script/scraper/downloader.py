@@ -0,0 +1,109 @@
+import os
+import asyncio
+import hashlib
+import aiohttp
+
+from image_store import ImageStore
+from rate_limiter import RateLimiter, THROTTLE_STATUSES
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryableStatus(Exception):
+    pass
+
+
+class ImageDownloader:
+    def __init__(
+        self,
+        store: ImageStore,
+        concurrency: int = 16,
+        retries: int = 3,
+        backoff: float = 0.5,
+        chunk_size: int = 64 * 1024,
+        limiter: RateLimiter = None
+    ):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+        self.store = store
+        self.limiter = limiter or RateLimiter(rate=concurrency * 4)
+        self.targets = {}
+
+    def add(self, url_names: list[tuple[str, str]], folder: str):
+        for url, filename in url_names:
+            filepath = os.path.join(folder, filename)
+            paths = self.targets.setdefault(url, [])
+            if filepath not in paths:
+                paths.append(filepath)
+
+    def run(self):
+        asyncio.run(self.download_all())
+
+    async def download_all(self):
+        jobs = {}
+        for url, paths in self.targets.items():
+            missing = [path for path in paths if not os.path.exists(path)]
+            if not missing:
+                continue
+            if (digest := self.store.lookup(url)):
+                for path in missing:
+                    self.store.link(digest, path)
+            else:
+                jobs[url] = missing
+        self.targets = {}
+        if not jobs:
+            return
+        print(f"Downloading {len(jobs)} images...")
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        try:
+            async with aiohttp.ClientSession(connector=connector) as session:
+                await asyncio.gather(*(
+                    self.download(session, semaphore, url, paths)
+                    for url, paths in jobs.items()
+                ))
+        finally:
+            self.store.save()
+
+    async def download(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        paths: list[str]
+    ):
+        for attempt in range(self.retries + 1):
+            try:
+                async with semaphore:
+                    await self.limiter.acquire_async()
+                    if not (digest := await self.fetch(session, url)):
+                        return
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError, RetryableStatus) as e:
+                if attempt == self.retries:
+                    print(f"Failed to download {url} ({e!r})")
+                    return
+                self.limiter.retry()
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+        for path in paths:
+            self.store.link(digest, path)
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> str | None:
+        async with session.get(url) as response:
+            if response.status in THROTTLE_STATUSES:
+                self.limiter.throttle(response.headers.get('Retry-After'))
+            if response.status in RETRY_STATUSES:
+                raise RetryableStatus(response.status)
+            self.limiter.succeed()
+            if response.status != 200:
+                return None
+            temp_path = self.store.temp_path(url)
+            digest = hashlib.sha256()
+            with open(temp_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    digest.update(chunk)
+                    f.write(chunk)
+            return self.store.commit(url, temp_path, digest.hexdigest())
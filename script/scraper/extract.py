@@ -0,0 +1,84 @@
+import re
+
+from cell import Element
+
+
+# A stat cell leads with its value: "12 (24 in Expert)", "4 / 5", "6.5".
+STAT_RE = re.compile(r'[^/ (]*')
+NON_INTEGER_RE = re.compile(r'\D')
+NON_DECIMAL_RE = re.compile(r'[^\d.]')
+DIFFICULTY_CLASSES = ('m-normal', 'm-expert', 'm-master')
+
+
+def stat_value(text: str, cast: type = int) -> int | float:
+    return cast(STAT_RE.match(text.strip()).group().strip())
+
+
+def cell_stat(cell: Element, cast: type = int) -> int | float | None:
+    if (p := cell.select_one('p')) is None:
+        return None
+    return stat_value(p.text, cast)
+
+
+def first_string(cell: Element) -> str:
+    # The first piece of text, as get_text(strip=True, separator='/') would
+    # start with it.
+    for string in cell.strings():
+        if (string := string.strip()):
+            return string.split('/')[0]
+    return ''
+
+
+def value_range(text: str, cast: type = int) -> tuple | None:
+    """(low, high) of the first word of a quantity or rate.
+
+    "3–5" gives (3, 5), "~12" gives (12, 12) and "8.33%" gives (8.33, 8.33)
+    as floats; text without digits gives None.
+    """
+    strip = NON_INTEGER_RE if cast is int else NON_DECIMAL_RE
+    text = text.split(' ')[0].strip(' ~').replace('–', '-')
+    if '-' in text:
+        low, high = text.split('-')[:2]
+        low = strip.sub('', low)
+        high = strip.sub('', high)
+        if low and high:
+            return (cast(low), cast(high))
+        return None
+    value = strip.sub('', text)
+    if value:
+        return (cast(value), cast(value))
+    return None
+
+
+def difficulty_spans(cell: Element) -> list[Element | None]:
+    """The parts of a cell that apply in normal, expert and master mode.
+
+    Cells without an m-normal span apply to every mode; an m-expert-master
+    span covers both expert and master.
+    """
+    if (normal := cell.select_one('span', 'm-normal')) is None:
+        return [cell, cell, cell]
+    if (expert := cell.select_one('span', 'm-expert')):
+        return [normal, expert, cell.select_one('span', 'm-master')]
+    expert_master = cell.select_one('span', 'm-expert-master')
+    return [normal, expert_master, expert_master]
+
+
+def span_values(spans: list[Element | None], cast: type = int) -> list[tuple] | None:
+    values = []
+    seen = {}
+    for span in spans:
+        if span is None:
+            raise ValueError("Missing difficulty span.")
+        if id(span) not in seen:
+            seen[id(span)] = value_range(first_string(span), cast)
+        values.append(seen[id(span)])
+    if all(values):
+        return values
+    if not any(values):
+        return None
+    raise ValueError("Values not all None or all not None.")
+
+
+def difficulty_values(cell: Element, cast: type = int) -> list[tuple] | None:
+    return span_values(difficulty_spans(cell), cast)
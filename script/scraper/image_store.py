@@ -0,0 +1,61 @@
+import os
+import json
+import shutil
+import hashlib
+
+
+class ImageStore:
+    """Content-addressed blobs with per-name views linked into them."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.blob_folder = os.path.join(folder, 'blobs')
+        self.index_file = os.path.join(folder, 'urls.json')
+        os.makedirs(self.blob_folder, exist_ok=True)
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r') as f:
+                self.urls = json.load(f)
+        else:
+            self.urls = {}
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_folder, digest[:2], digest)
+
+    def lookup(self, url: str) -> str | None:
+        digest = self.urls.get(url)
+        if digest and os.path.exists(self.blob_path(digest)):
+            return digest
+        return None
+
+    def temp_path(self, url: str) -> str:
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, f"{name}.part")
+
+    def commit(self, url: str, temp_path: str, digest: str) -> str:
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.replace(temp_path, blob)
+        self.urls[url] = digest
+        return digest
+
+    def link(self, digest: str, path: str):
+        blob = self.blob_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.lexists(path):
+            os.remove(path)
+        try:
+            os.link(blob, path)
+        except OSError:
+            try:
+                os.symlink(os.path.relpath(blob, os.path.dirname(path)), path)
+            except OSError:
+                shutil.copyfile(blob, path)
+
+    def save(self):
+        temp_file = f"{self.index_file}.part"
+        with open(temp_file, 'w') as f:
+            json.dump(self.urls, f, indent=4)
+        os.replace(temp_file, self.index_file)
@@ -0,0 +1,84 @@
+from html.parser import HTMLParser
+from typing import Iterable
+
+from cell import VOID_TAGS
+
+
+class LayoutParser(HTMLParser):
+    """Tag skeleton of a cell, e.g. <[document]><span.m-normal></span></[document]>.
+
+    The layout is written out while tokenizing, closing tags the way
+    BeautifulSoup's tree would: void tags at once, an end tag everything
+    opened after its match, and whatever is left open at the end.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.stack = []
+
+    def layout(self, markup: str) -> str:
+        self.reset()
+        self.parts = ['<[document]>']
+        self.stack = []
+        self.feed(markup)
+        self.close()
+        while self.stack:
+            self.parts.append(f'</{self.stack.pop()}>')
+        self.parts.append('</[document]>')
+        return ''.join(self.parts)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str]]):
+        classes = ''
+        for key, value in attrs:
+            if key == 'class':
+                classes = value or ''
+        classes = classes.split()
+        self.parts.append(f"<{tag}.{'.'.join(classes)}>" if classes else f'<{tag}>')
+        if tag in VOID_TAGS:
+            self.parts.append(f'</{tag}>')
+        else:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str]]):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.parts.append(f'</{self.stack.pop()}>')
+
+    def handle_endtag(self, tag: str):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i] == tag:
+                while len(self.stack) > i:
+                    self.parts.append(f'</{self.stack.pop()}>')
+                return
+
+
+class LayoutProfiler:
+    """Groups column values by layout, tokenizing each distinct value once."""
+
+    def __init__(self):
+        self.parser = LayoutParser()
+        self.cache = {}
+
+    def layout(self, value: str) -> str:
+        if (layout := self.cache.get(value)) is None:
+            layout = self.cache[value] = self.parser.layout(value)
+        return layout
+
+    def profile(self, rows: Iterable[dict], fields: list[str] = None) -> dict[str, dict]:
+        # Every requested field is profiled in the same pass over the rows;
+        # without fields, every column of every row is.
+        profiles = {field: {} for field in fields or ()}
+        for row in rows:
+            for field in fields or row:
+                if field not in row:
+                    raise ValueError(f"Field '{field}' not in row.")
+                value = row[field]
+                layouts = profiles.setdefault(field, {})
+                layout = self.layout(value)
+                if layout not in layouts:
+                    layouts[layout] = {'count': 1, 'fields': [value]}
+                else:
+                    layouts[layout]['count'] += 1
+                    layouts[layout]['fields'].append(value)
+        return profiles
@@ -1,12 +1,14 @@
 import os
-import asyncio
-import aiohttp
+import sys
 import json
 
 from scrapers.itemscraper import ItemScraper
 from scrapers.recipescraper import RecipeScraper
 from scrapers.dropscraper import DropScraper
 from scrapers.npcscraper import NpcScraper
+from downloader import ImageDownloader
+from image_store import ImageStore
+from rate_limiter import RateLimiter
 
 
 def parse_cookies(cookies: str) -> dict:
@@ -24,45 +26,38 @@ def get_from_data(data: list[dict], field: str, value: str) -> list[dict]:
     return list(filter(lambda x: x[field] == value, data))
 
 
-def download_images(url_names: list[tuple[str, str]], folder: str):
-    os.makedirs(folder, exist_ok=True)
-    loop = asyncio.get_event_loop()
-    tasks = [download_image(url, folder, filename) for url, filename in url_names]
-    loop.run_until_complete(asyncio.wait(tasks))
-
-
-async def download_image(url: str, folder: str, filename: str):
-    filepath = os.path.join(folder, filename)
-    if os.path.exists(filepath):
-        return
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status == 200:
-                with open(filepath, 'wb') as f:
-                    while True:
-                        chunk = await response.content.read(1024)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-
-
 def main():
     cache_folder = "src/cache/"
     data_folder = "src/data/"
     image_folder = "src/images/"
     url = "https://terraria.fandom.com/wiki/Special:CargoQuery"
+    wiki_limiter = RateLimiter(rate=5)
+    image_limiter = RateLimiter(rate=50)
+    options = {
+        'workers': 4,
+        'parse_workers': os.cpu_count() or 1,
+        'limiter': wiki_limiter
+    }
+    store = ImageStore(os.path.join(image_folder, '.store'))
+    downloader = ImageDownloader(store, concurrency=16, limiter=image_limiter)
     with open('script/scraper/cookie.txt', 'r') as f:
         cookies = parse_cookies(f.read())
 
-    item_scraper = ItemScraper(url, cookies, data_folder, cache_folder)
-    recipe_scraper = RecipeScraper(url, cookies, data_folder, cache_folder)
-    drop_scraper = DropScraper(url, cookies, data_folder, cache_folder)
-    npc_scraper = NpcScraper(url, cookies, data_folder, cache_folder)
-
-    item_data = item_scraper.get_parsed_data()
-    recipe_data = recipe_scraper.get_parsed_data()
-    drop_data = drop_scraper.get_parsed_data()
-    npc_data = npc_scraper.get_parsed_data()
+    item_scraper = ItemScraper(url, cookies, data_folder, cache_folder, **options)
+    recipe_scraper = RecipeScraper(url, cookies, data_folder, cache_folder, **options)
+    drop_scraper = DropScraper(url, cookies, data_folder, cache_folder, **options)
+    npc_scraper = NpcScraper(url, cookies, data_folder, cache_folder, **options)
+
+    if '--update' in sys.argv[1:]:
+        item_data = item_scraper.update()
+        recipe_data = recipe_scraper.update()
+        drop_data = drop_scraper.update()
+        npc_data = npc_scraper.update()
+    else:
+        item_data = item_scraper.get_parsed_data()
+        recipe_data = recipe_scraper.get_parsed_data()
+        drop_data = drop_scraper.get_parsed_data()
+        npc_data = npc_scraper.get_parsed_data()
 
     item_image = []
     item_image_equipped = []
@@ -97,10 +92,10 @@ def main():
             filename = f'{name}.png'
             npc_image.append((url, filename))
 
-    download_images(item_image, os.path.join(image_folder, 'item'))
-    download_images(item_image_equipped, os.path.join(image_folder, 'item_equipped'))
-    download_images(item_image_placed, os.path.join(image_folder, 'item_placed'))
-    download_images(npc_image, os.path.join(image_folder, 'npc'))
+    downloader.add(item_image, os.path.join(image_folder, 'item'))
+    downloader.add(item_image_equipped, os.path.join(image_folder, 'item_equipped'))
+    downloader.add(item_image_placed, os.path.join(image_folder, 'item_placed'))
+    downloader.add(npc_image, os.path.join(image_folder, 'npc'))
 
     tables = set()
     for recipe in recipe_data:
@@ -148,7 +143,7 @@ def main():
             url = table['table_image']
             filename = f'{name}.png'
             table_image.append((url, filename))
-    download_images(table_image, os.path.join(image_folder, 'table'))
+    downloader.add(table_image, os.path.join(image_folder, 'table'))
     with open(os.path.join(data_folder, 'Tables.json'), 'w') as f:
         f.write(json.dumps(table_data, indent=4))
 
@@ -167,13 +162,18 @@ def main():
             url = boss['boss_icon']
             filename = f'{name}.png'
             boss_image.append((url, filename))
-    download_images(boss_image, os.path.join(image_folder, 'boss'))
+    downloader.add(boss_image, os.path.join(image_folder, 'boss'))
+
+    downloader.run()
 
     with open(os.path.join(data_folder, 'Bosses.json'), 'w') as f:
         f.write(json.dumps(boss_data, indent=4))
     with open(os.path.join(data_folder, 'Events.json'), 'w') as f:
         f.write(json.dumps(event_data, indent=4))
 
+    wiki_limiter.report("Wiki")
+    image_limiter.report("Images")
+
     drop_scraper.print_field_layouts("rate")
 if __name__ == '__main__':
     main()
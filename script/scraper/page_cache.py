@@ -0,0 +1,130 @@
+import os
+import json
+import gzip
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class FileCache:
+    """One <name>.html file per page with a .meta.json sidecar."""
+
+    # Pages are stored as the serialized div.mw-spcontent, not the response.
+    raw_bodies = False
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.folder, f"{name}.html")
+
+    def contains(self, name: str) -> bool:
+        return os.path.exists(self.path(name))
+
+    def read(self, name: str) -> bytes:
+        with open(self.path(name), 'rb') as f:
+            return f.read()
+
+    def meta(self, name: str) -> dict:
+        meta_file = f"{self.path(name)}.meta.json"
+        if os.path.exists(meta_file):
+            with open(meta_file, 'r') as f:
+                return json.load(f)
+        # Entries cached before metadata was kept count as fetched when written.
+        return {'fetched_at': os.path.getmtime(self.path(name))}
+
+    def write(self, name: str, body: bytes, meta: dict):
+        with open(self.path(name), 'wb') as f:
+            f.write(body)
+        self.write_meta(name, meta)
+
+    def write_meta(self, name: str, meta: dict):
+        with open(f"{self.path(name)}.meta.json", 'w') as f:
+            json.dump(meta, f, indent=4)
+
+
+class ArchiveCache:
+    """Compressed response bodies appended to one archive per table.
+
+    The index maps each page name to the offset and length of its latest
+    record plus its revalidation metadata; superseded records stay in the
+    archive until it is rebuilt.
+    """
+
+    raw_bodies = True
+
+    def __init__(self, folder: str, table: str):
+        os.makedirs(folder, exist_ok=True)
+        self.archive_file = os.path.join(folder, f"{table}.archive")
+        self.index_file = os.path.join(folder, f"{table}.archive.index.json")
+        self.codec = 'zstd' if zstandard else 'gzip'
+        self.lock = threading.Lock()
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r') as f:
+                self.index = json.load(f)
+        else:
+            self.index = {}
+
+    def __getstate__(self) -> dict:
+        # Scrapers are pickled into parse workers; the lock stays behind.
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def contains(self, name: str) -> bool:
+        return name in self.index
+
+    def read(self, name: str) -> bytes:
+        entry = self.index[name]
+        with open(self.archive_file, 'rb') as f:
+            f.seek(entry['offset'])
+            data = f.read(entry['length'])
+        return self.decompress(data, entry['codec'])
+
+    def meta(self, name: str) -> dict:
+        return self.index[name]['meta']
+
+    def write(self, name: str, body: bytes, meta: dict):
+        data = self.compress(body)
+        with self.lock:
+            with open(self.archive_file, 'ab') as f:
+                offset = f.tell()
+                f.write(data)
+            self.index[name] = {
+                'offset': offset,
+                'length': len(data),
+                'codec': self.codec,
+                'meta': meta
+            }
+            self.save_index()
+
+    def write_meta(self, name: str, meta: dict):
+        with self.lock:
+            self.index[name]['meta'] = meta
+            self.save_index()
+
+    def save_index(self):
+        temp_file = f"{self.index_file}.part"
+        with open(temp_file, 'w') as f:
+            json.dump(self.index, f, indent=4)
+        os.replace(temp_file, self.index_file)
+
+    def compress(self, body: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=10).compress(body)
+        return gzip.compress(body, compresslevel=9)
+
+    def decompress(self, data: bytes, codec: str) -> bytes:
+        if codec == 'zstd':
+            if not zstandard:
+                raise RuntimeError("Cache entry is zstd-compressed but zstandard is not installed.")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
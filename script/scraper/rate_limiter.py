@@ -0,0 +1,123 @@
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+
+
+# Statuses the server uses to ask clients to slow down.
+THROTTLE_STATUSES = {429, 503}
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date.
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket pacing every request made to one host.
+
+    Callers reserve a token and sleep for however long the reservation
+    says, so the same bucket serves threads and coroutines alike. Each
+    throttled response halves the rate and honours Retry-After; every
+    successful one wins a little of it back, up to the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = None,
+        min_rate: float = 0.5,
+        recovery: float = 0.05
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst or max(int(rate), 1)
+        self.recovery = recovery
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        self.started = self.updated
+        self.requests = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.retries = 0
+        self.throttled = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        # Takes a token now and returns how long to wait before using it.
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = max(-self.tokens / self.rate, self.blocked_until - now, 0.0)
+            self.requests += 1
+            if delay > 0:
+                self.waits += 1
+                self.wait_time += delay
+            return delay
+
+    def acquire(self):
+        if (delay := self.reserve()) > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        if (delay := self.reserve()) > 0:
+            await asyncio.sleep(delay)
+
+    def succeed(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery * self.max_rate)
+
+    def throttle(self, retry_after: str | None = None):
+        with self.lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            delay = retry_after_seconds(retry_after)
+            if delay is None:
+                delay = 1 / self.rate
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.tokens = min(self.tokens, 0.0)
+
+    def retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def metrics(self) -> dict:
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                'requests': self.requests,
+                'requests_per_sec': self.requests / elapsed if elapsed > 0 else 0.0,
+                'waits': self.waits,
+                'wait_time': self.wait_time,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'rate': self.rate
+            }
+
+    def report(self, name: str):
+        m = self.metrics()
+        print(f"{name}: {m['requests']} requests ({m['requests_per_sec']:.1f}/s), "
+              f"{m['waits']} waits ({m['wait_time']:.1f}s), {m['retries']} retries, "
+              f"{m['throttled']} throttled, pacing at {m['rate']:.1f}/s")
@@ -0,0 +1,125 @@
+from html.parser import HTMLParser
+
+from cell import Element, Comment, VOID_TAGS
+
+
+class RowStream(HTMLParser):
+    """Incremental reader for the first table.cargoTable of a page.
+
+    Rows are yielded as soon as their <tr> closes; only the cells of the
+    row being read are kept as trees, so memory is bounded by one page of
+    markup rather than a soup of it.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.found_table = False
+        self.table = None
+        self.table_done = False
+        self.thead = None
+        self.header_row = None
+        self.columns = None
+        self.tbody = None
+        self.tbody_done = False
+        self.row = None
+        self.cells = []
+        self.capture = None
+        self.pending = []
+
+    def rows(self, body: str | bytes):
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        for i in range(0, len(body), self.chunk_size):
+            self.feed(body[i:i + self.chunk_size])
+            yield from self.pop_rows()
+        self.close()
+        yield from self.pop_rows()
+
+    def pop_rows(self) -> list[dict]:
+        rows, self.pending = self.pending, []
+        return rows
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str]]):
+        attrs = {k: '' if v is None else v for k, v in attrs}
+        depth = len(self.stack)
+        element = None
+        if self.capture is not None:
+            element = Element(tag, attrs)
+            self.stack[-1][1].children.append(element)
+        elif self.table is None:
+            if tag == 'table' and not self.table_done and 'cargoTable' in attrs.get('class', '').split():
+                self.table = depth
+                self.found_table = True
+        elif tag == 'thead' and self.thead is None and self.columns is None:
+            self.thead = depth
+        elif tag == 'tr' and self.thead == depth - 1 and self.columns is None:
+            self.header_row = depth
+            self.columns = []
+        elif tag == 'th' and self.header_row is not None:
+            element = Element(tag, attrs)
+            self.capture = depth
+        elif tag == 'tbody' and self.tbody is None and not self.tbody_done:
+            self.tbody = depth
+        elif tag == 'tr' and self.tbody is not None and self.row is None:
+            self.row = depth
+            self.cells = []
+        elif tag == 'td' and self.row is not None and 'class' in attrs:
+            element = Element(tag, attrs)
+            self.capture = depth
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, element))
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str]]):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > i:
+            self.close_element(len(self.stack) - 1, self.stack.pop()[1])
+
+    def close_element(self, depth: int, element: Element | None):
+        if depth == self.capture:
+            self.capture = None
+            if element.name == 'th':
+                self.columns.append(element.text)
+            else:
+                self.cells.append(element.decode_contents())
+        elif depth == self.header_row:
+            self.header_row = None
+        elif depth == self.thead:
+            self.thead = None
+        elif depth == self.row:
+            self.row = None
+            if self.cells:
+                row_data = {}
+                for i, value in enumerate(self.cells):
+                    row_data[self.columns[i]] = value
+                self.pending.append(row_data)
+        elif depth == self.tbody:
+            self.tbody = None
+            self.tbody_done = True
+        elif depth == self.table:
+            self.table = None
+            self.table_done = True
+
+    def handle_data(self, data: str):
+        if self.capture is None:
+            return
+        children = self.stack[-1][1].children
+        if children and type(children[-1]) is str:
+            children[-1] += data
+        else:
+            children.append(data)
+
+    def handle_comment(self, data: str):
+        if self.capture is not None:
+            self.stack[-1][1].children.append(Comment(data))
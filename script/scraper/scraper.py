@@ -1,102 +1,233 @@
 from bs4 import BeautifulSoup as soup
 import requests
+import requests.adapters
 import os
 import json
+import time
+import pickle
+import hashlib
+import itertools
+import collections
+import textwrap
+from typing import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-
-def soup_layout(element: soup) -> str:
-    layout = f'<{element.name}'
-    class_attr = element.get('class')
-    if class_attr:
-        layout += '.' + '.'.join(class_attr)
-    layout += '>'
-    for child in element.findChildren(recursive=False):
-        layout += soup_layout(child)
-    layout += f'</{element.name}>'
-    return layout
+from page_cache import FileCache, ArchiveCache
+from row_stream import RowStream
+from rate_limiter import RateLimiter, THROTTLE_STATUSES
+from cell import CellParser
+from layouts import LayoutProfiler
 
 
 class Scraper:
+    page_limit = 500
+    # How far back the wiki keeps recent changes; older updates rescrape.
+    recent_changes_window = 30 * 24 * 60 * 60
+    # Page titles per CargoQuery when refetching changed pages.
+    update_batch = 50
+    # Rows per chunk handed to a parse worker.
+    parse_chunk = 200
+
     def __init__(
         self,
         url: str,
         params: dict = None,
         cookies: dict = None,
         data_folder: str = None,
-        cache_folder: str = None
+        cache_folder: str = None,
+        workers: int = 1,
+        parse_workers: int = 1,
+        cache_ttl: float = None,
+        cache_backend: str = 'files',
+        limiter: RateLimiter = None,
+        retries: int = 3
     ):
         self.url = url
         self.params = params
         self.cookies = cookies
         self.data_folder = data_folder
         self.cache_folder = cache_folder
+        self.workers = max(workers, 1)
+        self.parse_workers = max(parse_workers, 1)
+        self.cache_ttl = cache_ttl
+        if cache_backend == 'files':
+            self.page_cache = FileCache(os.path.join(cache_folder, self.page_type()))
+        elif cache_backend == 'archive':
+            self.page_cache = ArchiveCache(cache_folder, self.page_type())
+        else:
+            raise ValueError(f"Unknown cache backend '{cache_backend}'.")
+        self.limiter = limiter or RateLimiter()
+        self.retries = retries
+        self.params.setdefault('offset', 0)
+        self.params.setdefault('limit', self.page_limit)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def __str__(self) -> str:
         return self.name()
 
-    def name(self) -> str:
-        range_str = f"{self.params['offset']+1}-{self.params['offset']+self.params['limit']}"
-        return f"{self.params['tables']}-{range_str}"
+    def name(self, params: dict = None) -> str:
+        params = params or self.params
+        range_str = f"{params['offset']+1}-{params['offset']+params['limit']}"
+        return f"{params['tables']}-{range_str}"
 
     def page_type(self) -> str:
         return self.params['tables']
 
-    def get_page(self) -> soup:
-        cache_folder = os.path.join(self.cache_folder, self.page_type())
-        if not os.path.exists(cache_folder):
-            os.makedirs(cache_folder)
-        cache_file = os.path.join(cache_folder, f"{self.name()}.html")
-        if os.path.exists(cache_file):
-            with open(cache_file, 'rb') as f:
-                content = soup(f.read(), 'html.parser')
+    def page_params(self, offset: int) -> dict:
+        return {**self.params, 'offset': offset, 'limit': self.page_limit}
+
+    def is_stale(self, meta: dict) -> bool:
+        if self.cache_ttl is None:
+            return False
+        return time.time() - meta.get('fetched_at', 0) > self.cache_ttl
+
+    def get_page(self, params: dict = None) -> soup:
+        return self.page_content(self.get_page_body(params))
+
+    def get_page_body(self, params: dict = None) -> bytes:
+        params = params or self.params
+        name = self.name(params)
+        if not self.page_cache.contains(name):
+            return self.refresh_page(params)
+        meta = self.page_cache.meta(name)
+        if self.is_stale(meta):
+            return self.refresh_page(params, meta)
+        return self.page_cache.read(name)
+
+    def refresh_page(self, params: dict, meta: dict = None) -> bytes:
+        name = self.name(params)
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        response = self.fetch(params, headers)
+        if response.status_code == 304:
+            meta['fetched_at'] = time.time()
+            self.page_cache.write_meta(name, meta)
+            return self.page_cache.read(name)
+        if self.page_cache.raw_bodies:
+            body = response.content
         else:
-            content = self.get_soup()
-            with open(cache_file, 'wb') as f:
-                f.write(content.encode('utf-8'))
-        return content
+            body = self.page_content(response.text).encode('utf-8')
+        self.page_cache.write(name, body, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time()
+        })
+        return body
+
+    def fetch(self, params: dict, headers: dict = None) -> requests.Response:
+        if headers:
+            print(f"Revalidating {self.name(params)}...")
+        else:
+            print(f"Scraping {self.name(params)}...")
+        return self.request(self.url, params, headers)
+
+    def request(self, url: str, params: dict, headers: dict = None) -> requests.Response:
+        # Every request to the wiki is paced by the limiter; throttled
+        # responses are retried once the limiter lets them through again.
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.limiter.retry()
+            self.limiter.acquire()
+            response = self.session.get(
+                url, params=params, cookies=self.cookies, headers=headers
+            )
+            if response.status_code not in THROTTLE_STATUSES:
+                self.limiter.succeed()
+                return response
+            self.limiter.throttle(response.headers.get('Retry-After'))
+        response.raise_for_status()
+        return response
 
-    def get_soup(self) -> soup:
-        print(f"Scraping {self.name()}...")
-        response = requests.get(self.url, params=self.params, cookies=self.cookies)
-        content = soup(response.text, 'html.parser')
+    def page_content(self, text: str | bytes) -> soup:
+        content = soup(text, 'html.parser')
         content = content.select_one('div.mw-spcontent')
         return content
 
+    def get_soup(self, params: dict = None) -> soup:
+        params = params or self.params
+        return self.page_content(self.fetch(params).text)
+
+    def stream_rows(self, offset: int):
+        # Yields the rows of one page and returns whether the page existed.
+        params = self.page_params(offset)
+        stream = RowStream()
+        yield from stream.rows(self.get_page_body(params))
+        return stream.found_table
+
+    def get_rows(self, offset: int) -> list[dict] | None:
+        rows = []
+        stream = self.stream_rows(offset)
+        while True:
+            try:
+                rows.append(next(stream))
+            except StopIteration as stop:
+                return rows if stop.value else None
+
+    def iter_rows(self) -> Iterator[dict]:
+        if self.workers > 1:
+            yield from self.iter_rows_concurrent()
+            return
+        offset = 0
+        while (yield from self.stream_rows(offset)):
+            offset += self.page_limit
+
+    def iter_rows_concurrent(self) -> Iterator[dict]:
+        # Pages are fetched in windows of `workers` offsets; the first empty
+        # page ends the scrape, the rest of its window is discarded so rows
+        # always come back in offset order.
+        offset = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                offsets = [offset + i * self.page_limit for i in range(self.workers)]
+                for rows in executor.map(self.get_rows, offsets):
+                    if rows is None:
+                        return
+                    yield from rows
+                offset = offsets[-1] + self.page_limit
+
     def scrape(self) -> list[dict]:
-        self.params['offset'] = 0
-        self.params['limit'] = 500
-        soup = self.get_page()
-        data = []
-        while (table := soup.select_one('table.cargoTable')):
-            column_names = []
-            for th in table.select_one('thead > tr').select('th'):
-                column_names.append(th.text)
-            for row in table.select_one('tbody').select('tr:has(td[class])'):
-                row_data = {}
-                for i, td in enumerate(row.select('td[class]')):
-                    row_data[column_names[i]] = td.decode_contents()
-                data.append(row_data)
-            self.params['offset'] += self.params['limit']
-            soup = self.get_page()
-        return data
+        return list(self.iter_rows())
+
+    def write_rows(self, data_file: str, rows: Iterator[dict]) -> Iterator[dict]:
+        # Writes the same text as json.dump(rows, f, indent=4), one row at a
+        # time, and only replaces data_file once every row has been written.
+        temp_file = f"{data_file}.part"
+        with open(temp_file, 'w') as f:
+            f.write('[')
+            count = 0
+            for row in rows:
+                f.write(',\n' if count else '\n')
+                f.write(textwrap.indent(json.dumps(row, indent=4), '    '))
+                count += 1
+                yield row
+            f.write('\n]' if count else ']')
+        os.replace(temp_file, data_file)
 
-    def get_data(self) -> list[dict]:
+    def data_file(self, kind: str) -> str:
         if not os.path.exists(self.data_folder):
             os.makedirs(self.data_folder)
-        data_file = os.path.join(self.data_folder, f"{self.page_type()}_raw.json")
+        return os.path.join(self.data_folder, f"{self.page_type()}_{kind}.json")
+
+    def get_raw_data(self) -> Iterator[dict]:
+        data_file = self.data_file('raw')
         if os.path.exists(data_file):
             with open(data_file, 'r') as f:
                 data = json.load(f)
-        else:
-            data = self.scrape()
-            with open(data_file, 'w') as f:
-                json.dump(data, f, indent=4)
-        return data
+            return iter(data)
+        return self.write_rows(data_file, self.iter_rows())
+
+    def get_data(self) -> Iterable[dict]:
+        return self.filter_rows(self.get_raw_data())
 
     def get_parsed_data(self) -> list[dict]:
-        if not os.path.exists(self.data_folder):
-            os.makedirs(self.data_folder)
-        data_file = os.path.join(self.data_folder, f"{self.page_type()}_parsed.json")
+        data_file = self.data_file('parsed')
         if os.path.exists(data_file):
             with open(data_file, 'r') as f:
                 data = json.load(f)
@@ -106,34 +237,233 @@ class Scraper:
                 json.dump(data, f, indent=4)
         return data
 
-    def field_layouts(self, field: str) -> dict:
-        layouts = {}
-        for row in self.get_data():
-            if field not in row:
-                raise ValueError(f"Field '{field}' not in row.")
-            value = row[field]
-            layout = soup_layout(soup(value, 'html.parser'))
-            if layout not in layouts:
-                layouts[layout] = {'count': 1, 'fields': [value]}
+    def filter_rows(self, data: Iterable[dict]) -> Iterable[dict]:
+        return data
+
+    def finalize(self, parsed: list[dict]) -> list[dict]:
+        return parsed
+
+    def parse(self) -> list[dict]:
+        return self.finalize(self.parse_parallel(self.get_data()))
+
+    def api_url(self) -> str:
+        return self.url.split('/wiki/')[0] + '/api.php'
+
+    def update_path(self) -> str:
+        cache_folder = os.path.join(self.cache_folder, self.page_type())
+        os.makedirs(cache_folder, exist_ok=True)
+        return os.path.join(cache_folder, 'update.json')
+
+    def data_fingerprint(self) -> str:
+        # The raw and parsed files as update() last wrote them; a full
+        # scrape or a reparse since then changes it.
+        digest = hashlib.sha256()
+        for path in (self.data_file('raw'), self.data_file('parsed')):
+            with open(path, 'rb') as f:
+                while chunk := f.read(1 << 20):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def page_key(self, row: dict, parser: CellParser = None) -> str:
+        parser = parser or CellParser()
+        return parser.parse(row['Page']).text.strip()
+
+    def recent_changes(self, since: float) -> set[str] | None:
+        # Titles of articles edited since `since`, or None when that is
+        # further back than the wiki keeps its recent changes.
+        if time.time() - since > self.recent_changes_window:
+            return None
+        params = {
+            'action': 'query',
+            'list': 'recentchanges',
+            'rcnamespace': 0,
+            'rcprop': 'title',
+            'rcend': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(since)),
+            'rclimit': 'max',
+            'format': 'json'
+        }
+        titles = set()
+        while True:
+            print(f"Checking recent changes for {self.page_type()}...")
+            response = self.request(self.api_url(), params)
+            response.raise_for_status()
+            content = response.json()
+            for change in content['query']['recentchanges']:
+                titles.add(change['title'])
+            if 'continue' not in content:
+                return titles
+            params.update(content['continue'])
+
+    def query_rows(self, where: str) -> Iterator[dict]:
+        # Rows matching `where`, fetched fresh; these pages are never cached
+        # since their contents depend on the condition, not just the offset.
+        offset = 0
+        while True:
+            params = {**self.page_params(offset), 'where': where}
+            response = self.fetch(params)
+            response.raise_for_status()
+            count = 0
+            for row in RowStream().rows(response.content):
+                count += 1
+                yield row
+            if count < self.page_limit:
+                return
+            offset += self.page_limit
+
+    def changed_rows(self, titles: set[str]) -> list[dict]:
+        titles = sorted(titles)
+        rows = []
+        for i in range(0, len(titles), self.update_batch):
+            quoted = []
+            for title in titles[i:i + self.update_batch]:
+                title = title.replace('\\', '\\\\').replace('"', '\\"')
+                quoted.append(f'"{title}"')
+            rows.extend(self.query_rows(f"_pageName IN ({', '.join(quoted)})"))
+        return rows
+
+    def parse_aligned(self, rows: list[dict]) -> list[dict | None]:
+        # One entry per row: its parsed form, or None if the filter drops it.
+        kept = {id(row) for row in self.filter_rows(rows)}
+        parsed = iter(self.parse_parallel([row for row in rows if id(row) in kept]))
+        return [next(parsed) if id(row) in kept else None for row in rows]
+
+    def update(self) -> list[dict]:
+        """Brings the raw and parsed data up to date with the wiki.
+
+        Only pages edited since the last update are refetched; their rows
+        replace the old ones in place and are the only rows parsed again.
+        Falls back to revalidating every page when the last update is older
+        than the wiki's recent changes. Changed rows come from the same
+        rendered CargoQuery pages as a full scrape, so both kinds of rows
+        look alike in *_raw.json. standin.py checks the result against a
+        full scrape.
+        """
+        raw_file = self.data_file('raw')
+        parsed_file = self.data_file('parsed')
+        if not os.path.exists(raw_file) or not os.path.exists(parsed_file):
+            return self.get_parsed_data()
+        update_file = self.update_path()
+        state = {}
+        if os.path.exists(update_file):
+            with open(update_file, 'r') as f:
+                state = json.load(f)
+        since = state.get('updated_at', os.path.getmtime(raw_file))
+        started = time.time()
+        titles = self.recent_changes(since)
+        if titles is None:
+            print(f"{self.page_type()} is too old to update, revalidating every page...")
+            cache_ttl, self.cache_ttl = self.cache_ttl, 0
+            try:
+                rows = self.scrape()
+            finally:
+                self.cache_ttl = cache_ttl
+            aligned = self.parse_aligned(rows)
+        else:
+            with open(raw_file, 'r') as f:
+                old_rows = json.load(f)
+            # The parsed rows of the last update only stand for the current
+            # files if nothing has rewritten them since.
+            if 'rows' in state and state.get('fingerprint') == self.data_fingerprint():
+                old_aligned = state['rows']
             else:
-                layouts[layout]['count'] += 1
-                layouts[layout]['fields'].append(value)
-        return layouts
+                old_aligned = self.parse_aligned(old_rows)
+            parser = CellParser()
+            fresh = {}
+            new_rows = self.changed_rows(titles) if titles else []
+            for row, parsed in zip(new_rows, self.parse_aligned(new_rows)):
+                fresh.setdefault(self.page_key(row, parser), []).append((row, parsed))
+            rows = []
+            aligned = []
+            for row, parsed in zip(old_rows, old_aligned):
+                key = self.page_key(row, parser)
+                if key not in titles:
+                    rows.append(row)
+                    aligned.append(parsed)
+                    continue
+                for row, parsed in fresh.pop(key, []):
+                    rows.append(row)
+                    aligned.append(parsed)
+            for key in sorted(fresh):
+                for row, parsed in fresh[key]:
+                    rows.append(row)
+                    aligned.append(parsed)
+            print(f"Updated {len(new_rows)} rows from {len(titles)} changed pages.")
+        for _ in self.write_rows(raw_file, rows):
+            pass
+        data = self.finalize([parsed for parsed in aligned if parsed is not None])
+        with open(parsed_file, 'w') as f:
+            json.dump(data, f, indent=4)
+        state = {'updated_at': started, 'rows': aligned, 'fingerprint': self.data_fingerprint()}
+        with open(update_file, 'w') as f:
+            json.dump(state, f)
+        return data
+
+    def parse_rows(self, data: Iterable[dict]) -> list[dict]:
+        raise NotImplementedError
+
+    def parse_parallel(self, data: Iterable[dict]) -> list[dict]:
+        # Rows parse independently, so chunks are farmed out to worker
+        # processes and concatenated back in their original order. Chunks
+        # are taken from the stream as workers free up, so only a few are
+        # held at a time.
+        if self.parse_workers <= 1:
+            return self.parse_rows(data)
+        rows = iter(data)
+        first = list(itertools.islice(rows, self.parse_chunk))
+        if len(first) < self.parse_chunk:
+            return self.parse_rows(first)
+        try:
+            # Workers get the scraper pickled with every chunk; one that holds
+            # a lock or an open handle can only parse here.
+            pickle.dumps(self)
+        except (TypeError, AttributeError, pickle.PicklingError) as e:
+            print(f"Parallel parse unavailable ({e}), parsing serially...")
+            return self.parse_rows(itertools.chain(first, rows))
+        next_chunks = itertools.chain(
+            [first], iter(lambda: list(itertools.islice(rows, self.parse_chunk)), [])
+        )
+        parsed = []
+        # Chunks whose results are not collected yet, oldest first.
+        chunks = collections.deque()
+        futures = collections.deque()
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers) as executor:
+                while True:
+                    while len(futures) < self.parse_workers * 2:
+                        if (chunk := next(next_chunks, None)) is None:
+                            break
+                        chunks.append(chunk)
+                        futures.append(executor.submit(self.parse_rows, chunk))
+                    if not futures:
+                        break
+                    parsed.extend(futures.popleft().result())
+                    chunks.popleft()
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            print(f"Parallel parse unavailable ({e}), parsing serially...")
+            for chunk in chunks:
+                parsed.extend(self.parse_rows(chunk))
+            parsed.extend(self.parse_rows(itertools.chain.from_iterable(next_chunks)))
+        return parsed
+
+    def field_layouts(self, field: str) -> dict:
+        return self.profile_layouts([field])[field]
+
+    def profile_layouts(self, fields: list[str] = None) -> dict[str, dict]:
+        return LayoutProfiler().profile(self.get_data(), fields)
 
     def print_field_layouts(self, field: str):
         layouts = self.field_layouts(field)
-        s = soup("<head></head><body></body>", "html.parser")
+        parser = CellParser()
+        out = ["<head></head><body>"]
         for layout in layouts:
-            ul = soup('<ul>', 'html.parser')
+            out.append("<ul>")
             fields = layouts[layout]['fields']
             fields = list(set(fields))
             fields.sort()
             for field in fields:
                 field = field.replace('\n', '↵').replace('\t', '⇥').replace('\r', '↵')
-                li = soup('<li>', 'html.parser')
-                li.li.append(soup(field, 'html.parser'))
-                ul.ul.append(li)
-            s.body.append(ul)
-        out = "out.html"
-        with open(out, 'wb') as f:
-            f.write(s.encode('utf-8'))
+                out.append(f"<li>{parser.parse(field).decode_contents()}</li>")
+            out.append("</ul>")
+        out.append("</body>")
+        with open("out.html", 'wb') as f:
+            f.write(''.join(out).encode('utf-8'))
@@ -1,5 +1,8 @@
+from typing import Iterable
+
 from scraper import Scraper
-from bs4 import BeautifulSoup as soup
+from cell import CellParser, Row
+from extract import cell_stat
 
 
 class ItemScraper(Scraper):
@@ -8,7 +11,8 @@ class ItemScraper(Scraper):
         url: str,
         cookies: dict = None,
         data_folder: str = None,
-        cache_folder: str = None
+        cache_folder: str = None,
+        **kwargs
     ):
         params = {}
         params['tables'] = 'Items'
@@ -61,10 +65,9 @@ class ItemScraper(Scraper):
             'bodyslot=bodyslot',
             'buffs__full=buffs',
             'debuffs__full=debuffs'])
-        super().__init__(url, params, cookies, data_folder, cache_folder)
+        super().__init__(url, params, cookies, data_folder, cache_folder, **kwargs)
 
-    def get_data(self) -> list[dict]:
-        data = super().get_data()
+    def filter_rows(self, data: Iterable[dict]) -> Iterable[dict]:
         return filter(self.__filter_item, data)
 
     def __filter_item(self, item: dict) -> bool:
@@ -75,14 +78,15 @@ class ItemScraper(Scraper):
         valid &= item['internalname'] != 'None'
         return valid
 
-    def parse(self) -> list[dict]:
-        data = self.get_data()
+    def parse_rows(self, data: Iterable[dict]) -> list[dict]:
+        parser = CellParser()
         parsed = []
         for item in data:
-            parsed.append(self.parse_item(item))
+            parsed.append(self.parse_item(item, parser))
         return parsed
 
-    def parse_item(self, item: dict) -> dict:
+    def parse_item(self, item: dict, parser: CellParser = None) -> dict:
+        item = Row(item, parser)
         parsed = {}
         # Page information
         parsed['page_url'] = self.__parse_page_url(item)
@@ -122,94 +126,89 @@ class ItemScraper(Scraper):
         parsed['item_hardmode'] = self.__parse_item_hardmode(item)
         return self.__process_item(parsed)
 
-    def __parse_page_url(self, item: dict) -> str | None:
-        content = soup(item['Page'], 'html.parser')
+    def __parse_page_url(self, item: Row) -> str | None:
+        content = item.cell('Page')
         if (a := content.select_one('a')):
             prefix = 'https://terraria.fandom.com'
             return prefix + a['href']
         else:
             return None
 
-    def __parse_page_title(self, item: dict) -> str:
-        content = soup(item['PageTitle'], 'html.parser')
+    def __parse_page_title(self, item: Row) -> str:
+        content = item.cell('PageTitle')
         return content.select_one('p').text.strip()
 
-    def __parse_page_id(self, item: dict) -> int:
+    def __parse_page_id(self, item: Row) -> int:
         return int(item['PageID'].replace(',', ''))
 
-    def __parse_item_id(self, item: dict) -> int:
+    def __parse_item_id(self, item: Row) -> int:
         if not item['itemid']:
             return None
         return int(item['itemid'].replace(',', ''))
 
-    def __parse_item_name(self, item: dict) -> str:
+    def __parse_item_name(self, item: Row) -> str:
         return item['name']
 
-    def __parse_item_internal_name(self, item: dict) -> str:
+    def __parse_item_internal_name(self, item: Row) -> str:
         return item['internalname']
 
-    def __parse_item_image(self, item: dict) -> str | None:
-        content = soup(item['image'], 'html.parser')
+    def __parse_item_image(self, item: Row) -> str | None:
+        content = item.cell('image')
         if (img := content.select_one('img')):
             url = img['src']
             return url
         else:
             return None
 
-    def __parse_item_image_placed(self, item: dict) -> str | None:
-        content = soup(item['imageplaced'], 'html.parser')
+    def __parse_item_image_placed(self, item: Row) -> str | None:
+        content = item.cell('imageplaced')
         if (img := content.select_one('img')):
             url = img['src']
             return url
         else:
             return None
 
-    def __parse_item_image_equipped(self, item: dict) -> str | None:
-        content = soup(item['imageequipped'], 'html.parser')
+    def __parse_item_image_equipped(self, item: Row) -> str | None:
+        content = item.cell('imageequipped')
         if (img := content.select_one('img')):
             url = img['src']
             return url
         else:
             return None
 
-    def __parse_item_autoswing(self, item: dict) -> bool:
+    def __parse_item_autoswing(self, item: Row) -> bool:
         return item['autoswing'] == 'Yes'
 
-    def __parse_item_stack(self, item: dict) -> int:
-        content = soup(item['stack'], 'html.parser')
-        text = content.select_one('p')
-        if not text:
-            return 1
-        text = text.text.strip()
-        stack = text.split('/')[0].strip()
-        return int(stack)
+    def __parse_item_stack(self, item: Row) -> int:
+        stack = cell_stat(item.cell('stack'))
+        return 1 if stack is None else stack
 
-    def __parse_item_consumable(self, item: dict) -> bool:
+    def __parse_item_consumable(self, item: Row) -> bool:
         return item['consumable'] == 'Yes'
 
-    def __parse_item_type(self, item: dict) -> list[str] | None:
+    def __parse_item_type(self, item: Row) -> list[str] | None:
         item_type = item['type']
         if not item_type:
             return None
-        content = soup(item_type, 'html.parser')
+        content = item.cell('type')
         text = content.text.split('•')
         text = [t.strip().capitalize() for t in text]
         return text
 
-    def __parse_item_listcat(self, item: dict) -> list[str] | None:
+    def __parse_item_listcat(self, item: Row) -> list[str] | None:
         listcat = item['listcat']
         if not listcat:
             return None
-        content = soup(listcat, 'html.parser')
+        content = item.cell('listcat')
         text = content.text.split('•')
         text = [t.strip().capitalize() for t in text]
         return text
 
-    def __parse_item_tag(self, item: dict) -> list[str] | None:
+    def __parse_item_tag(self, item: Row) -> list[str] | None:
         tag = item['tag']
         if not tag:
             return None
-        content = soup(tag, 'html.parser')
+        content = item.cell('tag')
         text = content.text.strip()
         tags = text.split('•')
         misc = [
@@ -230,115 +229,83 @@ class ItemScraper(Scraper):
         tags = [t.strip().capitalize() for t in tags]
         return tags
 
-    def __parse_item_damage(self, item: dict) -> int | None:
-        content = soup(item['damage'], 'html.parser')
-        text = content.select_one('p')
-        if text is None:
-            return None
-        text = text.text.strip()
-        damage = text.split('/')[0].strip()
-        damage = damage.split(' ')[0].strip()
-        damage = damage.split('(')[0].strip()
-        return int(damage)
+    def __parse_item_damage(self, item: Row) -> int | None:
+        return cell_stat(item.cell('damage'))
 
-    def __parse_item_damage_type(self, item: dict) -> str | None:
+    def __parse_item_damage_type(self, item: Row) -> str | None:
         text = item['damagetype'].split('\\')[0]
         return text.strip() if text else None
 
-    def __parse_item_defense(self, item: dict) -> int | None:
-        content = soup(item['defense'], 'html.parser')
-        text = content.select_one('p')
-        if text is None:
-            return None
-        text = text.text.strip()
-        defense = text.split('/')[0].strip()
-        defense = defense.split(' ')[0].strip()
-        defense = defense.split('(')[0].strip()
-        return int(defense)
-
-    def __parse_item_velocity(self, item: dict) -> float | None:
-        content = soup(item['velocity'], 'html.parser')
-        text = content.select_one('p')
-        if text is None:
-            return None
-        text = text.text.strip()
-        velocity = text.split('/')[0].strip()
-        velocity = velocity.split(' ')[0].strip()
-        velocity = velocity.split('(')[0].strip()
-        return float(velocity)
-
-    def __parse_item_knockback(self, item: dict) -> float | None:
-        content = soup(item['knockback'], 'html.parser')
-        text = content.select_one('p')
-        if text is None:
-            return None
-        text = text.text.strip()
-        knockback = text.split('/')[0].strip()
-        knockback = knockback.split(' ')[0].strip()
-        knockback = knockback.split('(')[0].strip()
-        return float(knockback)
-
-    def __parse_item_buy_price(self, item: dict) -> tuple[int, str] | None:
-        content = soup(item['buy'], 'html.parser')
-        if (price := content.select_one('span.coin')):
+    def __parse_item_defense(self, item: Row) -> int | None:
+        return cell_stat(item.cell('defense'))
+
+    def __parse_item_velocity(self, item: Row) -> float | None:
+        return cell_stat(item.cell('velocity'), float)
+
+    def __parse_item_knockback(self, item: Row) -> float | None:
+        return cell_stat(item.cell('knockback'), float)
+
+    def __parse_item_buy_price(self, item: Row) -> tuple[int, str] | None:
+        content = item.cell('buy')
+        if (price := content.select_one('span', 'coin')):
             value = price['data-sort-value']
             currency = "coins"
-        elif (price := content.select_one('span.coins')):
+        elif (price := content.select_one('span', 'coins')):
             value = price['title'].split()[0]
             currency = "medals"
         else:
             return None
         return (int(value), currency)
 
-    def __parse_item_sell_price(self, item: dict) -> tuple[int, str] | None:
-        content = soup(item['sell'], 'html.parser')
-        if (price := content.select_one('span.coin')):
+    def __parse_item_sell_price(self, item: Row) -> tuple[int, str] | None:
+        content = item.cell('sell')
+        if (price := content.select_one('span', 'coin')):
             value = price['data-sort-value']
             currency = "coins"
         else:
             return None
         return (int(value), currency)
 
-    def __parse_item_axe_power(self, item: dict) -> int | None:
+    def __parse_item_axe_power(self, item: Row) -> int | None:
         power = item['axe']
         if not power:
             return None
-        content = soup(power, 'html.parser')
+        content = item.cell('axe')
         if content.select_one('span'):
             return None
         text = content.select_one('p').text.strip().strip('%')
         return int(text)
 
-    def __parse_item_pickaxe_power(self, item: dict) -> int | None:
+    def __parse_item_pickaxe_power(self, item: Row) -> int | None:
         power = item['pick']
         if not power:
             return None
-        content = soup(power, 'html.parser')
+        content = item.cell('pick')
         text = content.select_one('p').text.strip()
         text = text.split()[0].strip().strip('%')
         return int(text)
 
-    def __parse_item_hammer_power(self, item: dict) -> int | None:
+    def __parse_item_hammer_power(self, item: Row) -> int | None:
         power = item['hammer']
         if not power:
             return None
-        content = soup(power, 'html.parser')
+        content = item.cell('hammer')
         text = content.select_one('p').text.strip().strip('%')
         return int(text)
 
-    def __parse_item_tooltips(self, item: dict) -> list[str] | None:
+    def __parse_item_tooltips(self, item: Row) -> list[str] | None:
         tooltip = item['tooltip']
         if not tooltip:
             return None
-        content = soup(tooltip, 'html.parser')
-        if (game_text := content.select_one('span.gameText')):
+        content = item.cell('tooltip')
+        if (game_text := content.select_one('span', 'gameText')):
             tooltips = game_text.get_text(separator='+').split('+')
             tooltips = [t.strip(" \"\'") for t in tooltips]
             return tooltips
         else:
             return None
 
-    def __parse_item_hardmode(self, item: dict) -> bool:
+    def __parse_item_hardmode(self, item: Row) -> bool:
         return item['hardmode'] == 'Yes'
 
     def __process_item(self, item: dict) -> dict:
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from scraper import Scraper
 from bs4 import BeautifulSoup as soup
 
@@ -8,7 +10,8 @@ class NpcScraper(Scraper):
         url: str,
         cookies: dict = None,
         data_folder: str = None,
-        cache_folder: str = None
+        cache_folder: str = None,
+        **kwargs
     ):
         params = {}
         params['tables'] = 'NPCs'
@@ -34,17 +37,15 @@ class NpcScraper(Scraper):
             "money=money",
             "npcid=npcid",
             "immunities__full=immunities"])
-        super().__init__(url, params, cookies, data_folder, cache_folder)
+        super().__init__(url, params, cookies, data_folder, cache_folder, **kwargs)
 
-    def get_data(self) -> list[dict]:
-        data = super().get_data()
+    def filter_rows(self, data: Iterable[dict]) -> Iterable[dict]:
         return filter(self.__filter_npc, data)
 
     def __filter_npc(self, npc: dict) -> bool:
         return True
 
-    def parse(self) -> list[dict]:
-        data = self.get_data()
+    def parse_rows(self, data: Iterable[dict]) -> list[dict]:
         parsed = []
         for npc in data:
             parsed.append(self.parse_npc(npc))
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from scraper import Scraper
 
 
@@ -7,7 +9,8 @@ class RecipeScraper(Scraper):
         url: str,
         cookies: dict = None,
         data_folder: str = None,
-        cache_folder: str = None
+        cache_folder: str = None,
+        **kwargs
     ):
         params = {}
         params['tables'] = 'Recipes'
@@ -23,10 +26,9 @@ class RecipeScraper(Scraper):
             "ingredients__full=ingredients",
             "ings=ings",
             "args=args"])
-        super().__init__(url, params, cookies, data_folder, cache_folder)
+        super().__init__(url, params, cookies, data_folder, cache_folder, **kwargs)
 
-    def get_data(self) -> list[dict]:
-        data = super().get_data()
+    def filter_rows(self, data: Iterable[dict]) -> Iterable[dict]:
         return filter(self.__filter_recipe, data)
 
     def __filter_recipe(self, recipe: dict) -> bool:
@@ -38,8 +40,7 @@ class RecipeScraper(Scraper):
             return True
         return 'pc' in version.lower()
 
-    def parse(self) -> list[dict]:
-        data = self.get_data()
+    def parse_rows(self, data: Iterable[dict]) -> list[dict]:
         parsed = []
         for recipe in data:
             parsed.append(self.parse_recipe(recipe))
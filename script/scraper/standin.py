@@ -0,0 +1,282 @@
+import os
+import json
+import html
+import hashlib
+import shutil
+import tempfile
+import threading
+import http.server
+import urllib.parse
+
+from cell import CellParser
+from rate_limiter import RateLimiter
+from scrapers.itemscraper import ItemScraper
+from scrapers.recipescraper import RecipeScraper
+from scrapers.dropscraper import DropScraper
+from scrapers.npcscraper import NpcScraper
+
+
+class StandinWiki:
+    """A local stand-in for the wiki's CargoQuery and recent-changes endpoints.
+
+    Tables are served from raw rows (as in *_raw.json) as CargoQuery result
+    pages, `_pageName IN (...)` conditions included; edits made through
+    edit_page() are reported by list=recentchanges. Result pages carry an
+    ETag and answer a matching If-None-Match with 304.
+    """
+
+    def __init__(self, tables: dict[str, list[dict]]):
+        self.tables = tables
+        self.changes = []
+        self.requests = 0
+        self.not_modified = 0
+        self.parser = CellParser()
+
+    def page_title(self, row: dict) -> str:
+        return self.parser.parse(row['Page']).text.strip()
+
+    def page_titles(self, table: str) -> list[str]:
+        return list(dict.fromkeys(self.page_title(row) for row in self.tables[table]))
+
+    def edit_page(self, table: str, title: str, rows: list[dict]):
+        # Replaces the rows of one page in place: no rows deletes the page,
+        # an unknown title appends a new one.
+        page_cell = f'<a href="/wiki/{title.replace(" ", "_")}" title="{html.escape(title)}">{html.escape(title)}</a>'
+        rows = [{**row, 'Page': page_cell} for row in rows]
+        old_rows = self.tables[table]
+        new_rows = []
+        for row in old_rows:
+            if self.page_title(row) != title:
+                new_rows.append(row)
+            elif rows:
+                new_rows.extend(rows)
+                rows = []
+        new_rows.extend(rows)
+        self.tables[table] = new_rows
+        self.changes.append(title)
+
+    def result_page(self, table: str, query: dict) -> str:
+        rows = self.tables[table]
+        columns = list(rows[0]) if rows else []
+        if 'where' in query:
+            titles = set(json.loads(f"[{query['where'].split('IN (', 1)[1][:-1]}]"))
+            rows = [row for row in rows if self.page_title(row) in titles]
+        offset, limit = int(query['offset']), int(query['limit'])
+        rows = rows[offset:offset + limit]
+        out = ['<html><body><div id="content"><div class="mw-spcontent">']
+        if not rows:
+            out.append('<p>No results</p>')
+        else:
+            out.append('<table class="cargoTable noMerge sortable"><thead><tr>')
+            out.extend(f'<th class="field_{column}">{html.escape(column)}</th>' for column in columns)
+            out.append('</tr></thead><tbody>')
+            for row in rows:
+                out.append('<tr>')
+                out.extend(f'<td class="field_{column}">{row[column]}</td>' for column in columns)
+                out.append('</tr>')
+            out.append('</tbody></table>')
+        out.append('</div></div></body></html>')
+        return '\n'.join(out)
+
+    def recent_changes(self) -> dict:
+        changes = [{'title': title} for title in self.changes]
+        return {'query': {'recentchanges': changes}}
+
+    def serve(self) -> tuple[http.server.HTTPServer, str]:
+        # Starts the server on a free port; returns it and its CargoQuery URL.
+        wiki = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                query = dict(urllib.parse.parse_qsl(url.query))
+                wiki.requests += 1
+                if url.path == '/api.php':
+                    body = json.dumps(wiki.recent_changes()).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    body = wiki.result_page(query['tables'], query).encode('utf-8')
+                    content_type = 'text/html; charset=utf-8'
+                    etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                    if self.headers.get('If-None-Match') == etag:
+                        wiki.not_modified += 1
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                self.send_response(200)
+                if url.path != '/api.php':
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://127.0.0.1:{server.server_port}/wiki/Special:CargoQuery"
+
+
+def scraper_for(scraper_class, url: str, folder: str, **kwargs):
+    return scraper_class(
+        url, None, os.path.join(folder, 'data'), os.path.join(folder, 'cache'),
+        limiter=RateLimiter(rate=1000), **kwargs
+    )
+
+
+def page_rows(wiki: StandinWiki, rows: list[dict]) -> dict[str, list[dict]]:
+    rows_of = {}
+    for row in rows:
+        rows_of.setdefault(wiki.page_title(row), []).append(row)
+    return rows_of
+
+
+def check_concurrent(scraper_class, table: str, rows: list[dict]) -> bool:
+    # Scrapes the stand-in with several workers and serially, each into an
+    # empty cache: the rows must come back the same and in the same order.
+    wiki = StandinWiki({table: rows})
+    server, url = wiki.serve()
+    folder = tempfile.mkdtemp()
+    try:
+        serial = scraper_for(scraper_class, url, os.path.join(folder, 'serial')).scrape()
+        concurrent = scraper_for(
+            scraper_class, url, os.path.join(folder, 'concurrent'), workers=4
+        ).scrape()
+        same = concurrent == serial
+        print(f"{table}: concurrent scrape {'matches' if same else 'DIFFERS from'} a serial one "
+              f"({len(concurrent)} rows)")
+        return same
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(folder)
+
+
+def check_revalidation(scraper_class, table: str, rows: list[dict]) -> bool:
+    # Scrapes the stand-in, edits one page, then rescrapes over the same
+    # cache with every page stale: unchanged pages must come back as 304s
+    # and the edit must show up as in a fresh scrape.
+    wiki = StandinWiki({table: rows})
+    server, url = wiki.serve()
+    folder = tempfile.mkdtemp()
+    try:
+        scraper_for(scraper_class, url, os.path.join(folder, 'old')).scrape()
+        titles = wiki.page_titles(table)
+        rows_of = page_rows(wiki, rows)
+        # The edit keeps the page's row count, so only its result pages change.
+        edited, source = rows_of[titles[0]], rows_of[titles[-1]]
+        wiki.edit_page(table, titles[0], [source[i % len(source)] for i in range(len(edited))])
+        wiki.requests = wiki.not_modified = 0
+        revalidated = scraper_for(
+            scraper_class, url, os.path.join(folder, 'old'), cache_ttl=0
+        ).scrape()
+        requests, not_modified = wiki.requests, wiki.not_modified
+        same = revalidated == scraper_for(scraper_class, url, os.path.join(folder, 'new')).scrape()
+        same = same and 0 < not_modified < requests
+        print(f"{table}: revalidation {'matches' if same else 'DIFFERS from'} a fresh scrape "
+              f"({not_modified} of {requests} pages not modified)")
+        return same
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(folder)
+
+
+def check_update(scraper_class, table: str, rows: list[dict]) -> bool:
+    # Scrapes the stand-in, edits it, updates, and compares the result with
+    # a fresh full scrape of the edited stand-in.
+    wiki = StandinWiki({table: rows})
+    server, url = wiki.serve()
+    folder = tempfile.mkdtemp()
+    try:
+        scraper_for(scraper_class, url, os.path.join(folder, 'old')).get_parsed_data()
+        titles = wiki.page_titles(table)
+        if len(titles) < 4:
+            print(f"{table}: too few pages to edit, skipped")
+            return True
+        rows_of = page_rows(wiki, rows)
+        # One page changed (it takes another page's rows), one deleted, one new.
+        wiki.edit_page(table, titles[1], rows_of[titles[-1]])
+        wiki.edit_page(table, titles[2], [])
+        wiki.edit_page(table, 'Stand-in Page', rows_of[titles[0]])
+        wiki.requests = 0
+        updated = scraper_for(scraper_class, url, os.path.join(folder, 'old')).update()
+        update_requests = wiki.requests
+        full = scraper_for(scraper_class, url, os.path.join(folder, 'new')).get_parsed_data()
+        # Compared as written, since parsers return tuples the files hold as lists.
+        same = json.loads(json.dumps(updated)) == json.loads(json.dumps(full))
+        raw = []
+        for side in ('old', 'new'):
+            with open(os.path.join(folder, side, 'data', f"{table}_raw.json"), 'r') as f:
+                raw.append(json.load(f))
+        same = same and raw[0] == raw[1]
+        print(f"{table}: update {'matches' if same else 'DIFFERS from'} a full scrape "
+              f"({update_requests} requests)")
+        return same
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(folder)
+
+
+def check_reparse(scraper_class, table: str, rows: list[dict]) -> bool:
+    # Updates once, reparses everything with a changed parser, then edits
+    # a page and updates again: the rows update() keeps from its last run
+    # must not bring back the old parser's output.
+    class Reparsed(scraper_class):
+        def parse_rows(self, data):
+            return [{**row, 'reparsed': True} for row in super().parse_rows(data)]
+
+    wiki = StandinWiki({table: rows})
+    server, url = wiki.serve()
+    folder = tempfile.mkdtemp()
+    try:
+        scraper_for(scraper_class, url, os.path.join(folder, 'old')).get_parsed_data()
+        scraper_for(scraper_class, url, os.path.join(folder, 'old')).update()
+        reparsed = scraper_for(Reparsed, url, os.path.join(folder, 'old'))
+        os.remove(reparsed.data_file('parsed'))
+        reparsed.get_parsed_data()
+        titles = wiki.page_titles(table)
+        rows_of = page_rows(wiki, rows)
+        wiki.edit_page(table, titles[0], rows_of[titles[-1]])
+        updated = scraper_for(Reparsed, url, os.path.join(folder, 'old')).update()
+        full = scraper_for(Reparsed, url, os.path.join(folder, 'new')).get_parsed_data()
+        same = json.loads(json.dumps(updated)) == json.loads(json.dumps(full))
+        print(f"{table}: update after a reparse {'matches' if same else 'DIFFERS from'} a full scrape")
+        return same
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(folder)
+
+
+def main():
+    data_folder = "src/data/"
+    scrapers = [
+        (ItemScraper, 'Items'),
+        (RecipeScraper, 'Recipes'),
+        (DropScraper, 'Drops'),
+        (NpcScraper, 'NPCs')
+    ]
+    ok = True
+    for scraper_class, table in scrapers:
+        data_file = os.path.join(data_folder, f"{table}_raw.json")
+        if not os.path.exists(data_file):
+            print(f"{table}: no raw data, skipped")
+            continue
+        with open(data_file, 'r') as f:
+            rows = json.load(f)
+        ok = check_concurrent(scraper_class, table, rows) and ok
+        ok = check_revalidation(scraper_class, table, rows) and ok
+        ok = check_update(scraper_class, table, rows) and ok
+        ok = check_reparse(scraper_class, table, rows) and ok
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()